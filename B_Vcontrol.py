@@ -1,45 +1,55 @@
 import cv2
-import mediapipe as mp
 import numpy as np
-import math
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-from ctypes import cast, POINTER
-import comtypes
-import wmi
 import os
 import sys
 import time
 import subprocess
-
-# Audio control
-devices = AudioUtilities.GetSpeakers()
-interface = devices.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
-volume = cast(interface, POINTER(IAudioEndpointVolume))
-
-# Brightness control
-wmi_service = wmi.WMI(namespace='wmi')
-brightness_ctrl = wmi_service.WmiMonitorBrightnessMethods()[0]
-
-# MediaPipe hands
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.7, min_tracking_confidence=0.7)
+from capture import open_capture
+from hand_tracking import FlowHandTracker
+from idle_gate import MotionGate
+from model_modes import graph_for
+from landmarks import HandArrays, pinch_distances, INDEX_TIP, THUMB_TIP
+from gesture_engine import GestureEngine, GestureMachine, T
+from level_backend import LevelWorker, make_backend
+from hud import WaveFill, HudCompositor
+from preview import Preview
+
+# Audio + brightness control (pycaw/WMI, sysfs/ALSA or fake: NEURO_LEVEL_BACKEND).
+# The worker applies only the latest level, at most 10 times a second, off the render loop
+levels = LevelWorker(make_backend)
+
+# MediaPipe hands (lite model, see model_modes.py; served warm by the inference daemon)
+hands = graph_for("levels")
+hand_arrays = HandArrays(max_hands=2)
+tracker = FlowHandTracker(hands, every=int(os.environ.get("NEURO_INFER_EVERY", "1")))
 
 # Utility functions
-def get_distance(p1, p2):
-    return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-
 def map_to_percentage(dist, min_d=20, max_d=150):
-    return int(np.interp(np.clip(dist, min_d, max_d), [min_d, max_d], [0, 100]))
+    # Works on scalars and arrays of distances alike
+    return np.interp(np.clip(dist, min_d, max_d), [min_d, max_d], [0, 100]).astype(int)
 
-cap = cv2.VideoCapture(0)
-screen_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-screen_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+cap = open_capture(profile="levels", threaded=True)
+screen_width = cap.negotiated.get("width") or int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+screen_height = cap.negotiated.get("height") or int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
 center_left = screen_width // 3
 center_right = 2 * center_left
 
-curr_volume, curr_brightness = 0, 0
+# HUD layout scales with the negotiated frame size (designed for 640x480)
+ui_scale = screen_height / 480
+bar_top, bar_bottom = int(100 * ui_scale), int(400 * ui_scale)
+bar_height = bar_bottom - bar_top
+bar_width = max(20, int(60 * ui_scale))
+label_y, percent_y, instruction_y = int(80 * ui_scale), int(450 * ui_scale), int(40 * ui_scale)
+left_center_x = center_left // 2
+right_center_x = center_right + (screen_width - center_right) // 2
+
+curr_volume, curr_brightness = levels.value("volume"), levels.value("brightness")
 last_seen = time.time()
 timeout_sec = 5
+idle_exit_sec = 60  # idle this long without motion and we hand back to the main UI
+idle_gate = MotionGate()
+WINDOW_NAME = f"Neuro-TouchFree : Fingertip Brightness and Volume Control (Idles after {timeout_sec} s, exits after {idle_exit_sec} s idle)"
+preview = Preview(WINDOW_NAME)  # NEURO_PREVIEW: full, every=N, fps=R or headless
 
 COLOR_BG = (10, 10, 30)
 COLOR_HUD = (80, 20, 40)
@@ -47,115 +57,137 @@ COLOR_VOLUME = (160, 40, 20)
 COLOR_BRIGHT = (160, 40, 20)
 FONT = cv2.FONT_HERSHEY_SIMPLEX
 
-wave_phase_vol = 0
-wave_phase_bright = 0
+# Gestures (gesture_engine.py): a pinch in the left third sets brightness, in the
+# right third volume; the frame context is (tips, percents) per hand
+def _zone_level(zone):
+    def level(f):
+        tips, percents = f.ctx
+        for ((x1, _), _), percent in zip(tips, percents):
+            if (x1 < center_left) if zone == "left" else (x1 > center_right):
+                return percent
+        return None
+    return level
+
+
+def set_brightness(f):
+    global curr_brightness
+    curr_brightness = levels.request("brightness", f["brightness_level"])
+
+
+def set_volume(f):
+    global curr_volume
+    curr_volume = levels.request("volume", f["volume_level"])
 
-def draw_wave_fill(img, x, y, width, height, percent, color, phase):
-    fill_height = int((percent / 100) * height)
-    wave_img = np.zeros((height, width, 3), dtype=np.uint8)
-    wave_color = np.array(color, dtype=np.uint8)
 
-    for i in range(width):
-        wave_y = int((math.sin((i / width * 2 * np.pi * 3) + phase) * 5) + (height - fill_height))
-        cv2.line(wave_img, (i, height), (i, wave_y), wave_color.tolist(), 1)
+gestures = GestureEngine({
+    "brightness_level": _zone_level("left"),
+    "volume_level": _zone_level("right"),
+}, [
+    GestureMachine("brightness", [T("idle", "idle", do=set_brightness)],
+                   guard=lambda f: f["brightness_level"] is not None),
+    GestureMachine("volume", [T("idle", "idle", do=set_volume)],
+                   guard=lambda f: f["volume_level"] is not None),
+])
 
-    mask = wave_img.astype(bool)
-    roi = img[y:y+height, x:x+width]
-    roi[mask] = wave_img[mask]
+wave_step = 0  # one phase step (~0.2 rad) per frame
 
-    img[y:y+height, x:x+width] = roi
-    return img
+vol_wave = WaveFill(bar_width, bar_height, COLOR_VOLUME)
+bright_wave = WaveFill(bar_width, bar_height, COLOR_BRIGHT)
+vol_x = right_center_x - bar_width // 2
+bright_x = left_center_x - bar_width // 2
+
+
+def draw_static_hud(hud):
+    # Labels, zone lines and instructions never change: drawn once, blended every frame
+    h, w = hud.shape[:2]
+    hud.text('VOLUME', (vol_x - 10, label_y), FONT, 0.6, COLOR_VOLUME, 2)
+    hud.text('BRIGHTNESS', (bright_x - 20, label_y), FONT, 0.6, COLOR_BRIGHT, 2)
+
+    # UI zone lines
+    hud.line((center_left, 0), (center_left, h), (30, 30, 60), 1)
+    hud.line((center_right, 0), (center_right, h), (30, 30, 60), 1)
+
+    # Instruction text (Center Top)
+    instruction = "Try with Hand-Gesture (Pinch-in & Pinch-out)"
+    text_size = cv2.getTextSize(instruction, FONT, 0.8, 2)[0]
+    text_x = (w - text_size[0]) // 2
+    hud.text(instruction, (text_x, instruction_y), FONT, 0.8, (200, 50, 200), 2)
+
+
+hud = None
 
 while True:
-    ret, frame = cap.read()
+    ret, frame, rgb = cap.read_frame()
     if not ret:
         break
 
-    frame = cv2.flip(frame, 1)
-    overlay = frame.copy()
-    output = frame.copy()
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     h, w, _ = frame.shape
+    if hud is None or hud.shape != frame.shape:
+        # From 720p up only the rectangles drawn into get blended (hud.py)
+        hud = HudCompositor(frame.shape, alpha=0.85)
+        hud.build_static(draw_static_hud)
+    show_hud = preview.visible()  # no HUD work on frames nobody sees
+    if show_hud:
+        hud.begin(frame)
 
     hand_found = False
-    results = hands.process(rgb)
+    results = tracker.process(rgb)
 
     if results.multi_hand_landmarks:
         last_seen = time.time()
-        for handLms in results.multi_hand_landmarks:
-            index = handLms.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-            thumb = handLms.landmark[mp_hands.HandLandmark.THUMB_TIP]
-
-            x1, y1 = int(index.x * w), int(index.y * h)
-            x2, y2 = int(thumb.x * w), int(thumb.y * h)
-
-            dist = get_distance((x1, y1), (x2, y2))
-            percent = map_to_percentage(dist)
-
-            if x1 < center_left:
-                curr_brightness = percent
-                brightness_ctrl.WmiSetBrightness(curr_brightness, 0)
-            elif x1 > center_right:
-                curr_volume = percent
-                volume.SetMasterVolumeLevelScalar(curr_volume / 100, None)
-
-            # Smaller dots
-            cv2.circle(overlay, (x1, y1), 10, COLOR_BRIGHT, -1)
-            cv2.circle(overlay, (x2, y2), 10, COLOR_BRIGHT, -1)
-            cv2.line(overlay, (x1, y1), (x2, y2), COLOR_HUD, 2)
-
-            hand_found = True
-
-    # Timeout check
+        pts = hand_arrays.fill(results, w, h)
+        # Pinch distance -> percentage for every hand at once
+        percents = map_to_percentage(pinch_distances(pts) / ui_scale)
+        tips = pts[:, [INDEX_TIP, THUMB_TIP], :2].astype(np.int32).tolist()
+        gestures.step((tips, percents.tolist()))
+        hand_found = True
+        if show_hud:
+            for (x1, y1), (x2, y2) in tips:
+                # Smaller dots
+                hud.circle((x1, y1), 10, COLOR_BRIGHT, -1)
+                hud.circle((x2, y2), 10, COLOR_BRIGHT, -1)
+                hud.line((x1, y1), (x2, y2), COLOR_HUD, 2)
+
+    # Timeout check: park in the idle tier first, only leave if nothing moves
     if not hand_found and time.time() - last_seen > timeout_sec:
+        print("No hand detected. Idling until motion...")
+        idle_state = idle_gate.wait_for_motion(cap, idle_exit_sec, preview)
+        if idle_state == "motion":
+            print("Motion detected. Resuming...")
+            last_seen = time.time()
+            continue
+        if idle_state != "timeout":
+            break
         print("No hand detected. Returning to Main UI...")
+        levels.close()
         cap.release()
-        cv2.destroyAllWindows()
-        try:
-            import mainUI
-        except ImportError:
-            subprocess.run(['python', 'mainUI.py'])
+        preview.close()
+        if not preview.headless:  # a background service just exits
+            try:
+                import mainUI
+            except ImportError:
+                subprocess.run(['python', 'mainUI.py'])
         exit()
 
-    # UI Zones
-    bar_top, bar_bottom = 100, 400
-    bar_height = bar_bottom - bar_top
-    bar_width = 60
-
-    left_center_x = center_left // 2
-    right_center_x = center_right + (w - center_right) // 2
+    if show_hud:
+        # Volume Bar
+        vol_wave.draw(hud.mark(vol_x, bar_top, vol_x + bar_width, bar_top + bar_height),
+                      vol_x, bar_top, curr_volume, wave_step)
+        hud.text(f'{curr_volume}%', (vol_x + 5, percent_y), FONT, 0.6, COLOR_VOLUME, 2)
 
-    # Volume Bar
-    vol_x = right_center_x - bar_width // 2
-    overlay = draw_wave_fill(overlay, vol_x, bar_top, bar_width, bar_height, curr_volume, COLOR_VOLUME, wave_phase_vol)
-    cv2.putText(overlay, f'{curr_volume}%', (vol_x + 5, 450), FONT, 0.6, COLOR_VOLUME, 2)
-    cv2.putText(overlay, 'VOLUME', (vol_x - 10, 80), FONT, 0.6, COLOR_VOLUME, 2)
-
-    # Brightness Bar
-    bright_x = left_center_x - bar_width // 2
-    overlay = draw_wave_fill(overlay, bright_x, bar_top, bar_width, bar_height, curr_brightness, COLOR_BRIGHT, wave_phase_bright)
-    cv2.putText(overlay, f'{curr_brightness}%', (bright_x + 5, 450), FONT, 0.6, COLOR_BRIGHT, 2)
-    cv2.putText(overlay, 'BRIGHTNESS', (bright_x - 20, 80), FONT, 0.6, COLOR_BRIGHT, 2)
-
-    # UI zone lines
-    cv2.line(overlay, (center_left, 0), (center_left, h), (30, 30, 60), 1)
-    cv2.line(overlay, (center_right, 0), (center_right, h), (30, 30, 60), 1)
-
-    # Instruction text (Center Top)
-    instruction = "Try with Hand-Gesture (Pinch-in & Pinch-out)"
-    text_size = cv2.getTextSize(instruction, FONT, 0.8, 2)[0]
-    text_x = (w - text_size[0]) // 2
-    cv2.putText(overlay, instruction, (text_x, 40), FONT, 0.8, (200, 50, 200), 2)
+        # Brightness Bar
+        bright_wave.draw(hud.mark(bright_x, bar_top, bright_x + bar_width, bar_top + bar_height),
+                         bright_x, bar_top, curr_brightness, wave_step)
+        hud.text(f'{curr_brightness}%', (bright_x + 5, percent_y), FONT, 0.6, COLOR_BRIGHT, 2)
 
-    # Blend final output
-    cv2.addWeighted(overlay, 0.85, output, 0.15, 0, output)
-    cv2.imshow("Neuro-TouchFree : Fingertip Brightness and Volume Control (Timeout- 5 Seconds)", output)
+        # Blend the HUD into the frame, dirty regions only
+        hud.composite()
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+    if not preview.show(frame):
         break
 
-    wave_phase_vol += 0.2
-    wave_phase_bright += 0.2
+    wave_step += 1
 
+levels.close()
 cap.release()
-cv2.destroyAllWindows()
+preview.close()
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+
+# Runs OS side effects (key presses, clicks, scrolls) on a worker thread so the
+# vision loop only appends to a queue and never waits on input injection.
+#
+#   executor = ActionExecutor(cooldowns={"show_desktop": 1.0},
+#                             coalesce={"scroll"}, collapse={"left_click"})
+#   executor.submit("scroll", mouse.scroll, 0, -3)
+#
+# cooldowns  name -> seconds: submissions closer than this to the last accepted
+#            one are dropped (replaces time.sleep after an action)
+# coalesce   names whose pending submission absorbs the next one, summing the
+#            numeric arguments (five queued scrolls of 2 become one of 10)
+# collapse   names dropped while an identical action is still pending
+#
+# Actions run in submission order; stats() reports queue depth and the delay
+# between submit and run.
+
+
+class ActionExecutor:
+    def __init__(self, cooldowns=None, coalesce=(), collapse=()):
+        self.cooldowns = dict(cooldowns or {})
+        self.coalesce = set(coalesce)
+        self.collapse = set(collapse)
+        self.pending = deque()  # [name, fn, args, submitted_at]
+        self.accepted_at = {}
+        self.cond = threading.Condition()
+        self.running = True
+        self.submitted = self.executed = self.failed = 0
+        self.coalesced = self.collapsed = self.cooled = 0
+        self.max_depth = 0
+        self.total_wait = self.max_wait = 0.0
+        self.total_run = 0.0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, name, fn, *args):
+        now = time.perf_counter()
+        with self.cond:
+            self.submitted += 1
+            cooldown = self.cooldowns.get(name)
+            if cooldown and now - self.accepted_at.get(name, -cooldown) < cooldown:
+                self.cooled += 1
+                return False
+            if self.pending and (name in self.coalesce or name in self.collapse):
+                # Only the newest entry may absorb: merging past other actions would reorder them
+                last = self.pending[-1]
+                if last[0] == name and name in self.coalesce:
+                    last[2] = tuple(a + b if isinstance(a, (int, float)) else b for a, b in zip(last[2], args))
+                    self.coalesced += 1
+                    self.accepted_at[name] = now
+                    return True
+                if name in self.collapse and any(item[0] == name for item in self.pending):
+                    # Dropped, so it doesn't restart the cooldown either
+                    self.collapsed += 1
+                    return False
+            self.accepted_at[name] = now
+            self.pending.append([name, fn, args, now])
+            self.max_depth = max(self.max_depth, len(self.pending))
+            self.cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and not self.pending:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                name, fn, args, submitted_at = self.pending.popleft()
+            start = time.perf_counter()
+            wait = start - submitted_at
+            try:
+                fn(*args)
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Action '{name}' failed: {e}")
+            self.executed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.total_run += time.perf_counter() - start
+
+    @property
+    def depth(self):
+        return len(self.pending)
+
+    def stats(self):
+        executed = max(self.executed, 1)
+        return {
+            "submitted": self.submitted, "executed": self.executed, "failed": self.failed,
+            "coalesced": self.coalesced, "collapsed": self.collapsed, "cooled": self.cooled,
+            "depth": self.depth, "max_depth": self.max_depth,
+            "wait_ms": round(self.total_wait / executed * 1000, 2),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "run_ms": round(self.total_run / executed * 1000, 2),
+        }
+
+    def close(self, drain=True):
+        # drain=True lets queued actions finish (e.g. a pending Alt release)
+        with self.cond:
+            if not drain:
+                self.pending.clear()
+            self.running = False
+            self.cond.notify()
+        self.thread.join(timeout=2.0)
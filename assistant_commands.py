@@ -0,0 +1,45 @@
+from command_registry import CommandRegistry
+
+# The voice assistant's commands as a table: trigger phrases per command,
+# compiled into one matcher by CommandRegistry. The side effects live in
+# voice_control.py, which subclasses AssistantActions; these hooks do nothing,
+# so the table can be benchmarked without a desktop.
+
+APPS = ("notepad", "calculator", "command prompt", "camera", "control panel", "paint", "vs code")
+
+
+class AssistantActions:
+    def open_app(self, app): pass
+    def open_youtube(self): pass
+    def open_google(self): pass
+    def play_music(self): pass
+    def tell_time(self): pass
+    def joke(self): pass
+    def wikipedia(self, query): pass
+    def email(self): pass
+    def goodbye(self): pass
+    def shutdown(self): pass
+    def restart(self): pass
+    def sleep(self): pass
+    def search(self, query): pass
+
+
+def build_assistant_registry(actions):
+    registry = CommandRegistry(fallback=actions.search)
+    for app in APPS:
+        registry.add(f"open {app}", [f"open {app}", f"launch {app}", f"start {app}"],
+                     lambda app=app: actions.open_app(app))
+    registry.add("youtube", ["open youtube"], actions.open_youtube)
+    registry.add("google", ["open google", "google search"], actions.open_google)
+    registry.add("music", ["play music", "play some music", "play a song"], actions.play_music)
+    registry.add("time", ["time", "what time is it", "what's the time"], actions.tell_time)
+    registry.add("joke", ["joke", "tell me a joke"], actions.joke)
+    registry.add("wikipedia", ["wikipedia {query}", "search wikipedia for {query}",
+                               "{query} according to wikipedia"], actions.wikipedia)
+    registry.add("email", ["email", "send an email", "send email"], actions.email)
+    registry.add("goodbye", ["no thanks", "you can sleep", "goodbye"], actions.goodbye)
+    # Power commands only fire when they are the whole request, not a word in a sentence
+    registry.add("shutdown", ["shutdown", "shut down", "shut down the computer"], actions.shutdown, exact=True)
+    registry.add("restart", ["restart", "restart the computer"], actions.restart, exact=True)
+    registry.add("sleep", ["sleep", "go to sleep", "put the computer to sleep"], actions.sleep, exact=True)
+    return registry
@@ -0,0 +1,190 @@
+import argparse
+import os
+import signal
+import threading
+import time
+import numpy as np
+from shm_ring import ShmRing
+from speech_backend import RATE, FRAME, FRAME_MS, read_wav
+
+# One microphone for every voice feature. The capture service reads the device
+# (or a WAV file) once, in 30 ms frames, and publishes them into a shared-memory
+# ring; the waveform, the recogniser and code1's voice typing each subscribe
+# and read every frame in order from their own position, so nobody reopens the
+# device per command and no two streams compete for it.
+#
+#   python audio_capture.py                          # resident service
+#   python audio_capture.py --source clip.wav --loop
+#
+# In a module, start_audio() attaches to a running service or starts one on a
+# thread, and subscribe() returns a reader. A capture that only lives for one
+# phrase (code1's voice typing) passes private_ring, so it never publishes on the
+# shared ring where a long-lived consumer could attach to it and go deaf when it
+# closes. NEURO_AUDIO_SOURCE=clip.wav swaps the microphone for a recording
+# (paced like a live mic) in tests.
+
+AUDIO_RING_NAME = "neuro_audio"
+AUDIO_SOURCE = os.environ.get("NEURO_AUDIO_SOURCE", "mic")
+AUDIO_SLOTS = 256  # ~7.7 s a slow subscriber can fall behind before losing frames
+
+
+def mic_frames():
+    import pyaudio
+    p = pyaudio.PyAudio()
+    stream = p.open(format=pyaudio.paInt16, channels=1, rate=RATE, input=True, frames_per_buffer=FRAME)
+    try:
+        while True:
+            yield np.frombuffer(stream.read(FRAME, exception_on_overflow=False), np.int16)
+    finally:
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+
+
+def wav_source(path, loop=False):
+    # A clip paced at the mic's rate, so subscribers see a live-like stream
+    samples = read_wav(path)
+    samples = samples[:len(samples) // FRAME * FRAME].reshape(-1, FRAME)
+    next_frame = time.time()
+    while True:
+        for frame in samples:
+            next_frame += FRAME_MS / 1000
+            delay = next_frame - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            yield frame
+        if not loop:
+            return
+
+
+def source_frames(source=AUDIO_SOURCE, loop=False):
+    return mic_frames() if source == "mic" else wav_source(source, loop)
+
+
+class AudioCapture:
+    # Publishes a source into the ring on its own thread
+    def __init__(self, source=AUDIO_SOURCE, loop=False, ring_name=AUDIO_RING_NAME, slots=AUDIO_SLOTS):
+        self.source = source
+        self.ring_name = ring_name
+        self.frames = source_frames(source, loop)
+        self.ring = ShmRing.create(ring_name, (FRAME,), np.int16, slots,
+                                   info={"rate": RATE, "frame_ms": FRAME_MS, "started": time.time()})
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            for frame in self.frames:
+                if not self.running:
+                    break
+                self.ring.write(frame)
+        except Exception as e:
+            print(f"⚠️ Audio capture stopped: {e}")
+        finally:
+            self.running = False
+            self.frames.close()
+
+    def close(self):
+        self.running = False
+        self.thread.join(timeout=1.0)
+        self.ring.close()
+
+
+class AudioSubscriber:
+    # Reads every frame in order from where it joined. A reader that falls more
+    # than the ring behind skips ahead and counts the frames it lost.
+    def __init__(self, ring_name=AUDIO_RING_NAME, timeout=1.0):
+        self.ring = ShmRing.attach(ring_name)
+        self.timeout = timeout
+        self.next_seq = self.ring.write_seq + 1
+        self.dropped = 0
+        self.frame = np.empty(FRAME, np.int16)
+
+    def skip(self):
+        # Forget unread frames, e.g. before listening for a new command
+        self.next_seq = self.ring.write_seq + 1
+
+    def read(self, copy=True, timeout=None):
+        # The next frame, or None if nothing arrived within the timeout. With
+        # copy=False the same private buffer is reused for every frame.
+        deadline = time.time() + (self.timeout if timeout is None else timeout)
+        while True:
+            write_seq = self.ring.write_seq
+            if write_seq >= self.next_seq:
+                # The slot after write_seq may already be being overwritten
+                oldest = write_seq - self.ring.slots + 2
+                if self.next_seq < oldest:
+                    self.dropped += oldest - self.next_seq
+                    self.next_seq = oldest
+                item = self.ring.get(self.next_seq)
+                if item is not None:
+                    out = np.empty(FRAME, np.int16) if copy else self.frame
+                    np.copyto(out, item[1])
+                    if self.ring.still_valid(self.next_seq):
+                        self.next_seq += 1
+                        return out
+                continue
+            if time.time() > deadline:
+                return None
+            time.sleep(0.005)
+
+    def __iter__(self):
+        # Ends when the service stops publishing
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    def close(self):
+        self.ring.close()
+
+
+def _service_running(ring_name, stale_after=1.0):
+    try:
+        ring = ShmRing.attach(ring_name)
+    except FileNotFoundError:
+        return False
+    item = ring.latest()
+    # A service that has only just started may not have published yet
+    last = item[1] if item is not None else ring.info.get("started", 0)
+    fresh = time.time() - last < stale_after
+    del item
+    ring.close()
+    return fresh
+
+
+def start_audio(source=AUDIO_SOURCE, ring_name=AUDIO_RING_NAME, private_ring=None):
+    # None if another process is already publishing; else this process's capture,
+    # on private_ring when given (subscribe to capture.ring_name)
+    if _service_running(ring_name):
+        return None
+    return AudioCapture(source, ring_name=private_ring or ring_name)
+
+
+def subscribe(ring_name=AUDIO_RING_NAME, timeout=1.0):
+    return AudioSubscriber(ring_name, timeout)
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared microphone capture")
+    parser.add_argument("--source", default=AUDIO_SOURCE, help="'mic' or a WAV file")
+    parser.add_argument("--loop", action="store_true", help="restart WAV files at the end")
+    parser.add_argument("--slots", type=int, default=AUDIO_SLOTS)
+    args = parser.parse_args()
+    signal.signal(signal.SIGTERM, _stop)
+    capture = AudioCapture(args.source, args.loop, slots=args.slots)
+    print(f"🎙️ Audio capture publishing {RATE} Hz, {FRAME_MS} ms frames from {args.source} on '{AUDIO_RING_NAME}'")
+    try:
+        while capture.running:
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        capture.close()
+        print("📴 Audio capture stopped")
@@ -0,0 +1,593 @@
+import argparse
+import time
+import numpy as np
+from frame_record import ReplayCapture
+
+# Offline benchmarks over frame_record.py recordings, so numbers can be
+# collected on headless boxes without a webcam.
+#
+#   python benchmarks.py flow session.nfr --every 1 2 3 5
+#   python benchmarks.py models session.nfr --modes cursor cursor.switcher levels keyboard
+#   python benchmarks.py gestures --frames 100000
+#   python benchmarks.py cursor session.nfr --filters legacy oneeuro predict
+#   python benchmarks.py keys --backend fake --length 2000
+#   python benchmarks.py hud --height 480 720 1080
+#   python benchmarks.py asr clips/*.wav --backends vosk google
+#   python benchmarks.py commands transcripts.txt --extra 0 100 1000
+
+
+def replay(path, limit=None):
+    cap = ReplayCapture(path, "fast")
+    count = 0
+    while limit is None or count < limit:
+        ret, frame, rgb = cap.read_frame()
+        if not ret:
+            break
+        count += 1
+        yield frame, rgb
+    cap.release()
+
+
+def hand_points(results, w, h):
+    # (hands, 21, 2) pixel coordinates, hands ordered left to right by wrist
+    if not results.multi_hand_landmarks:
+        return np.zeros((0, 21, 2), np.float32)
+    pts = np.array([[(lm.x * w, lm.y * h) for lm in hand.landmark]
+                    for hand in results.multi_hand_landmarks], np.float32)
+    return pts[np.argsort(pts[:, 0, 0])]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def report(rows, columns):
+    widths = [max(len(c), *(len(f"{r[c]}") for r in rows)) for c in columns]
+    print("  ".join(c.rjust(wd) for c, wd in zip(columns, widths)))
+    for r in rows:
+        print("  ".join(f"{r[c]}".rjust(wd) for c, wd in zip(columns, widths)))
+
+
+# ─── Optical-flow landmark propagation ─────────────────────────────────
+def bench_flow(args):
+    import mediapipe as mp
+    from hand_tracking import FlowHandTracker
+
+    def make_hands():
+        return mp.solutions.hands.Hands(max_num_hands=2, min_detection_confidence=0.7,
+                                        min_tracking_confidence=0.7)
+
+    # Reference: full inference on every frame
+    reference, ref_time = [], 0.0
+    with make_hands() as hands:
+        for _, rgb in replay(args.path, args.limit):
+            h, w = rgb.shape[:2]
+            results, dt = timed(hands.process, rgb)
+            ref_time += dt
+            reference.append(hand_points(results, w, h))
+
+    rows = []
+    for every in args.every:
+        with make_hands() as hands:
+            tracker = FlowHandTracker(hands, every=every)
+            drift, elapsed = [], 0.0
+            for i, (_, rgb) in enumerate(replay(args.path, args.limit)):
+                h, w = rgb.shape[:2]
+                results, dt = timed(tracker.process, rgb)
+                elapsed += dt
+                pts = hand_points(results, w, h)
+                if len(pts) and len(pts) == len(reference[i]):
+                    drift.append(float(np.linalg.norm(pts - reference[i], axis=2).mean()))
+            frames = max(tracker.frames, 1)
+            rows.append({
+                "every": every,
+                "ms/frame": f"{elapsed / frames * 1000:.2f}",
+                "speedup": f"{ref_time / elapsed if elapsed else 0:.2f}x",
+                "inferred": tracker.inferred,
+                "degraded": tracker.degraded,
+                "drift_px": f"{np.mean(drift) if drift else 0:.2f}",
+                "drift_p95": f"{np.percentile(drift, 95) if drift else 0:.2f}",
+            })
+    print(f"reference: {len(reference)} frames, {ref_time / max(len(reference), 1) * 1000:.2f} ms/frame")
+    report(rows, ["every", "ms/frame", "speedup", "inferred", "degraded", "drift_px", "drift_p95"])
+
+
+# ─── Per-mode model selection ──────────────────────────────────────────
+def bench_models(args):
+    from model_modes import graph_for
+
+    def run(mode):
+        points, elapsed, detected = [], 0.0, 0
+        with graph_for(mode, wait=0) as graph:
+            for _, rgb in replay(args.path, args.limit):
+                h, w = rgb.shape[:2]
+                results, dt = timed(graph.process, rgb)
+                elapsed += dt
+                pts = hand_points(results, w, h)
+                detected += len(pts) > 0
+                points.append(pts)
+        return points, elapsed, detected
+
+    reference, ref_time, _ = run(args.reference)
+    frames = max(len(reference), 1)
+    rows = []
+    for mode in args.modes:
+        points, elapsed, detected = run(mode)
+        error = []
+        for pts, ref in zip(points, reference):
+            n = min(len(pts), len(ref))
+            # Single-hand modes are compared against the reference's best-matching hand
+            for hand in pts[:n]:
+                error.append(min(float(np.linalg.norm(hand - r, axis=1).mean()) for r in ref))
+        rows.append({
+            "mode": mode,
+            "ms/frame": f"{elapsed / frames * 1000:.2f}",
+            "vs_ref": f"{ref_time / elapsed if elapsed else 0:.2f}x",
+            "detected": f"{detected / frames:.0%}",
+            "error_px": f"{np.mean(error) if error else 0:.2f}",
+            "error_p95": f"{np.percentile(error, 95) if error else 0:.2f}",
+        })
+    print(f"reference '{args.reference}': {frames} frames, {ref_time / frames * 1000:.2f} ms/frame")
+    report(rows, ["mode", "ms/frame", "vs_ref", "detected", "error_px", "error_p95"])
+
+
+# ─── Gesture engine evaluation ─────────────────────────────────────────
+def bench_gestures(args):
+    # Synthetic landmarks, no camera or model: measures the gesture table alone
+    from mouse_gestures import GestureActions, build_mouse_engine
+    rng = np.random.default_rng(0)
+    w, h = 640, 480
+    rows = []
+    for hands in args.hands:
+        frames = [rng.uniform(0, 1, (hands, 21, 3)).astype(np.float32) * (w, h, 1)
+                  for _ in range(256)]
+        engine = build_mouse_engine(GestureActions())
+        now = 0.0
+        start = time.perf_counter()
+        for i in range(args.frames):
+            now += 1 / 30
+            engine.step((frames[i % len(frames)], w, h), now)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "hands": hands,
+            "frames/s": f"{args.frames / elapsed:,.0f}",
+            "us/frame": f"{elapsed / args.frames * 1e6:.1f}",
+            "machines/frame": f"{engine.stepped / engine.frames:.2f}",
+        })
+    report(rows, ["hands", "frames/s", "us/frame", "machines/frame"])
+
+
+# ─── Cursor filters ────────────────────────────────────────────────────
+SCREEN = np.array([1920, 1080], np.float64)
+
+
+def _smooth(points, radius=5):
+    # Zero-phase moving average: the reference path for a real recording
+    kernel = np.ones(2 * radius + 1) / (2 * radius + 1)
+    padded = np.pad(points, ((radius, radius), (0, 0)), mode="edge")
+    return np.stack([np.convolve(padded[:, i], kernel, "valid") for i in range(2)], axis=1)
+
+
+def synthetic_track(fps=30, noise=2.5, seed=0):
+    # Rest, sweep across the screen and back, rest; timestamps jitter like a webcam
+    rng = np.random.default_rng(seed)
+    t = np.cumsum(rng.normal(1 / fps, 0.1 / fps, fps * 8))
+    phase = np.clip((t - 2) / 4, 0, 1)
+    truth = np.stack([960 + 600 * np.sin(2 * np.pi * phase), 540 + 200 * np.sin(4 * np.pi * phase)], axis=1)
+    return t, truth + rng.normal(0, noise, truth.shape), truth
+
+
+def recorded_track(path, limit=None):
+    from model_modes import graph_for
+    cap = ReplayCapture(path, "fast")
+    times, points = [], []
+    with graph_for("cursor", wait=0) as hands:
+        while limit is None or len(times) < limit:
+            ret, _, rgb = cap.read_frame()
+            if not ret:
+                break
+            h, w = rgb.shape[:2]
+            pts = hand_points(hands.process(rgb), w, h)
+            if len(pts) == 1:
+                times.append(cap.frame_time)
+                points.append(pts[0, 8] / (w, h) * SCREEN)  # index tip
+    cap.release()
+    points = np.array(points, np.float64).reshape(-1, 2)
+    return np.array(times), points, _smooth(points)
+
+
+def bench_cursor(args):
+    from cursor_filter import make_filter
+    if args.synthetic:
+        t, raw, reference = synthetic_track()
+    else:
+        t, raw, reference = recorded_track(args.path, args.limit)
+    if len(t) < 3:
+        print("not enough single-hand frames")
+        return
+
+    # Reference position and speed where the pointer is shown (latency after capture)
+    shown = t + args.latency
+    target = np.stack([np.interp(shown, t, reference[:, i]) for i in range(2)], axis=1)
+    speed = np.hypot(*np.gradient(reference, t, axis=0).T)
+    resting, moving = speed < args.rest_speed, speed > args.move_speed
+
+    rows = []
+    for name in args.filters:
+        cursor_filter = make_filter(name)
+        out = np.empty_like(raw)
+        for i in range(len(t)):
+            cursor_filter.update(raw[i], t[i])
+            out[i] = cursor_filter.position(shown[i])
+        steps = np.hypot(*np.diff(out, axis=0).T)
+        error = np.hypot(*(out - target).T)
+        lag = error[moving] / speed[moving] * 1000
+        rows.append({
+            "filter": name,
+            "jitter_px": f"{steps[resting[1:]].mean() if resting[1:].any() else 0:.2f}",
+            "rest_err_px": f"{error[resting].mean() if resting.any() else 0:.2f}",
+            "lag_ms": f"{np.median(lag) if moving.any() else 0:.1f}",
+            "lag_p95_ms": f"{np.percentile(lag, 95) if moving.any() else 0:.1f}",
+            "move_err_px": f"{error[moving].mean() if moving.any() else 0:.1f}",
+        })
+    print(f"{len(t)} frames, {np.diff(t).mean() * 1000:.1f} ms/frame, "
+          f"{resting.mean():.0%} at rest, {moving.mean():.0%} moving, pointer shown {args.latency * 1000:.0f} ms after capture")
+    report(rows, ["filter", "jitter_px", "rest_err_px", "lag_ms", "lag_p95_ms", "move_err_px"])
+
+
+# ─── Key injection ─────────────────────────────────────────────────────
+def bench_keys(args):
+    # Batched send vs one send per key; the fake backend also checks what got typed
+    import random
+    import string
+    from key_inject import make_injector, text_events, tap
+    rng = random.Random(0)
+    text = "".join(rng.choice(string.ascii_letters + string.digits + string.punctuation + " ")
+                   for _ in range(args.length))
+    events = text_events(text) + tap("enter")
+    rows = []
+    for mode in ("batched", "per key"):
+        injector = make_injector(args.backend, args.delay)
+        start = time.perf_counter()
+        if mode == "batched":
+            injector.send(events)
+        else:
+            for i in range(0, len(events), 2):
+                injector.send(events[i:i + 2])
+        elapsed = time.perf_counter() - start
+        typed = injector.text() if hasattr(injector, "text") else None
+        rows.append({
+            "mode": mode,
+            "events": len(events),
+            "calls": getattr(injector, "batches", "-"),
+            "events/s": f"{len(events) / elapsed:,.0f}",
+            "ms": f"{elapsed * 1000:.2f}",
+            "correct": "-" if typed is None else typed == text + "\n",
+        })
+    report(rows, ["mode", "events", "calls", "events/s", "ms", "correct"])
+
+
+# ─── HUD rendering ─────────────────────────────────────────────────────
+def draw_wave_fill_reference(img, x, y, width, height, percent, color, phase):
+    # The original B_Vcontrol renderer, kept as the baseline
+    import math
+    import cv2
+    fill_height = int((percent / 100) * height)
+    wave_img = np.zeros((height, width, 3), dtype=np.uint8)
+    wave_color = np.array(color, dtype=np.uint8)
+    for i in range(width):
+        wave_y = int((math.sin((i / width * 2 * np.pi * 3) + phase) * 5) + (height - fill_height))
+        cv2.line(wave_img, (i, height), (i, wave_y), wave_color.tolist(), 1)
+    mask = wave_img.astype(bool)
+    roi = img[y:y+height, x:x+width]
+    roi[mask] = wave_img[mask]
+    img[y:y+height, x:x+width] = roi
+    return img
+
+
+def bench_hud(args):
+    from hud import WaveFill
+    color = (160, 40, 20)
+    rows = []
+    for height in args.height:
+        # Bar geometry as B_Vcontrol lays it out for this frame height
+        scale = height / 480
+        bar_w, bar_h = max(20, int(60 * scale)), int(400 * scale) - int(100 * scale)
+        frame = np.zeros((height, height * 16 // 9, 3), np.uint8)
+        wave = WaveFill(bar_w, bar_h, color)
+        before = after = 0.0
+        mismatched = 0
+        for i in range(args.frames):
+            percent = i * 7 % 101
+            a, b = frame.copy(), frame.copy()
+            _, dt = timed(draw_wave_fill_reference, a, 10, 10, bar_w, bar_h, percent, color, wave.phase(i))
+            before += dt
+            _, dt = timed(wave.draw, b, 10, 10, percent, i)
+            after += dt
+            mismatched += int((a != b).any(axis=2).sum())
+        rows.append({
+            "height": height,
+            "bar": f"{bar_w}x{bar_h}",
+            "before_us": f"{before / args.frames * 1e6:.1f}",
+            "after_us": f"{after / args.frames * 1e6:.1f}",
+            "speedup": f"{before / after:.1f}x",
+            "diff_px": mismatched,
+        })
+    report(rows, ["height", "bar", "before_us", "after_us", "speedup", "diff_px"])
+    print()
+    bench_composite(args)
+
+
+class _Overlay:
+    # cv2 straight onto an image, with HudCompositor's drawing interface
+    def __init__(self, img):
+        self.img = img
+        self.shape = img.shape
+
+    def mark(self, *box):
+        return self.img
+
+    def circle(self, *a):
+        import cv2
+        cv2.circle(self.img, *a)
+
+    def line(self, *a):
+        import cv2
+        cv2.line(self.img, *a)
+
+    def text(self, *a):
+        import cv2
+        cv2.putText(self.img, a[0], *a[1:])
+
+
+def _hud_scene(height):
+    # B_Vcontrol's HUD at this frame height: two bars, two hands, labels, zone lines
+    import cv2
+    from hud import WaveFill
+    font, color = cv2.FONT_HERSHEY_SIMPLEX, (160, 40, 20)
+    w, scale = height * 16 // 9, height / 480
+    bar_w, top = max(20, int(60 * scale)), int(100 * scale)
+    bar_h = int(400 * scale) - top
+    bars = [(w // 6 - bar_w // 2, WaveFill(bar_w, bar_h, color)), (5 * w // 6 - bar_w // 2, WaveFill(bar_w, bar_h, color))]
+
+    def static(d):
+        for x, _ in bars:
+            d.text("LEVEL", (x - 10, int(80 * scale)), font, 0.6, color, 2)
+        d.line((w // 3, 0), (w // 3, height), (30, 30, 60), 1)
+        d.line((2 * w // 3, 0), (2 * w // 3, height), (30, 30, 60), 1)
+        d.text("Try with Hand-Gesture (Pinch-in & Pinch-out)", (w // 5, int(40 * scale)), font, 0.8, (200, 50, 200), 2)
+
+    def dynamic(d, i):
+        for k, (x, wave) in enumerate(bars):
+            percent = (i * 3 + k * 40) % 101
+            wave.draw(d.mark(x, top, x + bar_w, top + bar_h), x, top, percent, i)
+            d.text(f"{percent}%", (x + 5, int(450 * scale)), font, 0.6, color, 2)
+            tip = (x + 200 + i % 50, height // 2)
+            d.circle(tip, 10, color, -1)
+            d.circle((tip[0] + 30, tip[1] + 40), 10, color, -1)
+            d.line(tip, (tip[0] + 30, tip[1] + 40), (80, 20, 40), 2)
+    return w, static, dynamic
+
+
+def bench_composite(args):
+    import cv2
+    from hud import HudCompositor
+    rows = []
+    rng = np.random.default_rng(0)
+    for height in args.height:
+        w, static, dynamic = _hud_scene(height)
+        camera = rng.integers(0, 256, (height, w, 3), np.uint8)
+        hud = HudCompositor(camera.shape, alpha=0.85)
+        hud.build_static(static)
+        before = after = 0.0
+        mismatched = 0
+        for i in range(args.frames):
+            frame = camera.copy()
+            start = time.perf_counter()
+            overlay, output = frame.copy(), frame.copy()
+            d = _Overlay(overlay)
+            dynamic(d, i)
+            static(d)
+            cv2.addWeighted(overlay, 0.85, output, 0.15, 0, output)
+            before += time.perf_counter() - start
+
+            start = time.perf_counter()
+            hud.begin(frame)
+            dynamic(hud, i)
+            hud.composite()
+            after += time.perf_counter() - start
+            error = np.abs(frame.astype(np.int16) - output).max(axis=2)
+            mismatched += int((error > 1).sum())  # anti-aliased static text may round off by one
+        rows.append({
+            "frame": f"{w}x{height}",
+            "before_ms": f"{before / args.frames * 1000:.2f}",
+            "after_ms": f"{after / args.frames * 1000:.2f}",
+            "speedup": f"{before / after:.1f}x",
+            "blended": f"{hud.stats()['blended_fraction']:.0%}",
+            "diff_px": mismatched,
+        })
+    report(rows, ["frame", "before_ms", "after_ms", "speedup", "blended", "diff_px"])
+
+
+# ─── Speech recognition ────────────────────────────────────────────────
+def bench_asr(args):
+    # Time-to-first-action per clip: when the command text is in hand, in
+    # seconds from the clip start, had the clip been spoken live. Streaming
+    # recognisers can act on a partial hypothesis; batch ones wait for the
+    # endpoint and then the final result.
+    from speech_backend import BACKENDS, SpeechListener, wav_frames, read_wav, RATE
+    rows = []
+    for backend in args.backends:
+        listener = SpeechListener(BACKENDS[backend](), timeout=0)
+        for path in args.clips:
+            expected = args.expect.lower() if args.expect else None
+            # Acting on a partial needs to know what to look for
+            act = (lambda text: expected in text) if expected else None
+            start = time.perf_counter()
+            text = listener.listen(wav_frames(path), act)
+            compute = time.perf_counter() - start
+            t = listener.timings
+            audio = len(read_wav(path)) / RATE
+            ttfa = None if t["end"] is None else t["end"] + t["final_ms"] / 1000
+            rows.append({
+                "clip": path.rsplit("/", 1)[-1],
+                "backend": backend,
+                "audio_s": f"{audio:.2f}",
+                "speech_s": "-" if t["start"] is None else f"{t['start']:.2f}",
+                "partial_s": "-" if t["partial"] is None else f"{t['partial']:.2f}",
+                "endpoint_s": "-" if t["end"] is None else f"{t['end']:.2f}",
+                "final_ms": f"{t['final_ms']:.0f}",
+                "ttfa_s": "-" if ttfa is None else f"{ttfa:.2f}",
+                "rtf": f"{compute / audio:.2f}",
+                "text": text if len(text) < 40 else text[:37] + "...",
+            })
+    report(rows, ["clip", "backend", "audio_s", "speech_s", "partial_s", "endpoint_s", "final_ms", "ttfa_s", "rtf", "text"])
+
+
+# ─── Voice command dispatch ────────────────────────────────────────────
+# The old performCommand chain, first substring wins
+LEGACY_COMMANDS = [
+    ("open notepad", "open notepad"), ("open calculator", "open calculator"),
+    ("open command prompt", "open command prompt"), ("open camera", "open camera"),
+    ("open control panel", "open control panel"), ("open paint", "open paint"),
+    ("open vs code", "open vs code"), ("play music", "music"), ("time", "time"), ("joke", "joke"),
+    ("wikipedia", "wikipedia"), ("open youtube", "youtube"), ("open google", "google"),
+    ("shutdown", "shutdown"), ("restart", "restart"), ("sleep", "sleep"), ("email", "email"),
+    ("no thanks", "goodbye"), ("you can sleep", "goodbye"),
+]
+
+
+def legacy_command(chain, text):
+    for phrase, name in chain:
+        if phrase in text:
+            return name
+    return None
+
+
+def command_corpus(count, seed=0):
+    # Command phrases wrapped in chatter, plus sentences that should fall through to search
+    import random
+    from assistant_commands import APPS
+    rng = random.Random(seed)
+    phrases = [f"open {app}" for app in APPS] + [
+        "open youtube", "open google", "play music", "what time is it", "tell me a joke",
+        "search wikipedia for alan turing", "send an email", "no thanks", "you can sleep",
+        "shutdown", "restart the computer", "go to sleep"]
+    chatter = ["please", "jarvis", "can you", "now", "for me", "quickly", "hey"]
+    other = ["how do i restart my router", "i can't sleep at night", "sometimes i wonder why",
+             "best pizza near me", "what's the weather tomorrow", "who won the match yesterday",
+             "timeline of the roman empire", "how to write an email to my boss"]
+    corpus = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            corpus.append(rng.choice(other))
+        else:
+            words = [rng.choice(chatter) for _ in range(rng.randint(0, 2))]
+            words.insert(rng.randint(0, len(words)), rng.choice(phrases))
+            corpus.append(" ".join(words))
+    return corpus
+
+
+def bench_commands(args):
+    from assistant_commands import AssistantActions, build_assistant_registry
+    if args.path:
+        with open(args.path) as f:
+            corpus = [line.strip().lower() for line in f if line.strip()]
+    else:
+        corpus = command_corpus(args.count)
+    rows = []
+    for extra in args.extra:
+        # Unrelated commands, checked before the fallback like new features would be
+        custom = [(f"custom action {i} {i * 7}", f"custom {i}") for i in range(extra)]
+        chain = LEGACY_COMMANDS + custom
+        registry = build_assistant_registry(AssistantActions())
+        for phrase, name in custom:
+            registry.add(name, [phrase], lambda: None)
+        registry.compile()
+        results = {}
+        for matcher, fn in (("if-chain", lambda t: legacy_command(chain, t)),
+                            ("registry", lambda t: (m := registry.match(t)) and m.name)):
+            start = time.perf_counter()
+            results[matcher] = [fn(t) for t in corpus]
+            elapsed = time.perf_counter() - start
+            rows.append({
+                "matcher": matcher,
+                "commands": len(registry.names),
+                "transcripts/s": f"{len(corpus) / elapsed:,.0f}",
+                "us/transcript": f"{elapsed / len(corpus) * 1e6:.1f}",
+                "fallback": f"{results[matcher].count(None) / len(corpus):.0%}",
+            })
+        differ = [(t, a, b) for t, a, b in zip(corpus, results["if-chain"], results["registry"]) if a != b]
+        rows[-1]["differs"] = f"{len(differ) / len(corpus):.0%}"
+        rows[-2]["differs"] = "-"
+    report(rows, ["matcher", "commands", "transcripts/s", "us/transcript", "fallback", "differs"])
+    # Where the two disagree, so the new behaviour can be checked by eye
+    shown = set()
+    for text, old, new in differ:
+        if text not in shown and len(shown) < args.show:
+            shown.add(text)
+            print(f"  {text!r}: {old} -> {new}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks on recorded sessions")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    flow = sub.add_parser("flow", help="optical-flow propagation cost and drift vs full inference")
+    flow.add_argument("path")
+    flow.add_argument("--every", type=int, nargs="+", default=[1, 2, 3, 5])
+    flow.add_argument("--limit", type=int, default=None)
+    flow.set_defaults(func=bench_flow)
+
+    models = sub.add_parser("models", help="latency and landmark error of each model mode")
+    models.add_argument("path")
+    models.add_argument("--modes", nargs="+", default=["cursor", "cursor.switcher", "levels", "keyboard"])
+    models.add_argument("--reference", default="reference")
+    models.add_argument("--limit", type=int, default=None)
+    models.set_defaults(func=bench_models)
+
+    gestures = sub.add_parser("gestures", help="gesture-engine evaluation rate on synthetic landmarks")
+    gestures.add_argument("--hands", type=int, nargs="+", default=[1, 2])
+    gestures.add_argument("--frames", type=int, default=100000)
+    gestures.set_defaults(func=bench_gestures)
+
+    cursor = sub.add_parser("cursor", help="pointer jitter at rest and lag in motion per cursor filter")
+    cursor.add_argument("path", nargs="?")
+    cursor.add_argument("--synthetic", action="store_true", help="generated track with known ground truth")
+    cursor.add_argument("--filters", nargs="+", default=["legacy", "oneeuro", "predict"])
+    cursor.add_argument("--latency", type=float, default=0.04, help="capture-to-pointer delay (s)")
+    cursor.add_argument("--rest-speed", type=float, default=30.0, help="px/s below which the hand is at rest")
+    cursor.add_argument("--move-speed", type=float, default=300.0, help="px/s above which the hand is moving")
+    cursor.add_argument("--limit", type=int, default=None)
+    cursor.set_defaults(func=bench_cursor)
+
+    keys = sub.add_parser("keys", help="key-injection throughput, batched vs per key")
+    keys.add_argument("--backend", default="fake", help="fake, pyautogui or sendinput (types for real!)")
+    keys.add_argument("--length", type=int, default=2000)
+    keys.add_argument("--delay", type=float, default=0.0)
+    keys.set_defaults(func=bench_keys)
+
+    hud = sub.add_parser("hud", help="B_Vcontrol HUD: wave-fill cost per bar and full-frame compositing, old vs new")
+    hud.add_argument("--height", type=int, nargs="+", default=[480, 720, 1080])
+    hud.add_argument("--frames", type=int, default=300)
+    hud.set_defaults(func=bench_hud)
+
+    asr = sub.add_parser("asr", help="speech recognition time-to-first-action on recorded WAV clips")
+    asr.add_argument("clips", nargs="+")
+    asr.add_argument("--backends", nargs="+", default=["vosk", "google"])
+    asr.add_argument("--expect", help="act as soon as a partial contains this phrase")
+    asr.set_defaults(func=bench_asr)
+
+    commands = sub.add_parser("commands", help="voice-command dispatch throughput, if-chain vs compiled registry")
+    commands.add_argument("path", nargs="?", help="transcripts, one per line (default: generated)")
+    commands.add_argument("--count", type=int, default=20000)
+    commands.add_argument("--extra", type=int, nargs="+", default=[0, 100, 1000], help="extra commands registered")
+    commands.add_argument("--show", type=int, default=10, help="disagreements to print")
+    commands.set_defaults(func=bench_commands)
+
+    args = parser.parse_args()
+    if args.cmd == "cursor" and not (args.path or args.synthetic):
+        parser.error("cursor: give a recording or --synthetic")
+    args.func(args)
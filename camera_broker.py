@@ -0,0 +1,84 @@
+import argparse
+import signal
+import time
+import cv2
+import numpy as np
+from shm_ring import ShmRing
+from capture import FRAME_RING_NAME, CAMERA_SOURCE, parse_source, negotiate
+from frame_record import FrameRecorder
+
+# Resident capture broker: owns the camera, mirrors and colour-converts each frame
+# once and publishes [BGR, RGB] pairs into a shared-memory ring. Modules attach to
+# the ring through capture.open_capture() instead of reopening the device.
+#
+#   python camera_broker.py                      # default webcam
+#   python camera_broker.py --source clip.mp4 --loop
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def run_broker(source=CAMERA_SOURCE, slots=4, loop=False, ring_name=FRAME_RING_NAME, profile="broker",
+               record=None):
+    source = parse_source(source)
+    is_file = isinstance(source, str)
+    cap = cv2.VideoCapture(source)
+    negotiated = negotiate(cap, None if is_file else profile)
+    ret, raw = cap.read()
+    if not ret:
+        print("❌ Error: Unable to access camera.")
+        cap.release()
+        return
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    h, w, c = raw.shape
+    info = {"fps": fps, "negotiated": {"profile": negotiated["profile"], "fourcc": negotiated["fourcc"]}}
+    ring = ShmRing.create(ring_name, (2, h, w, c), np.uint8, slots, info=info)
+    recorder = FrameRecorder(record, {"negotiated": negotiated}) if record else None
+    print(f"📡 Camera broker publishing {w}x{h}@{fps:.0f} {negotiated['fourcc'] or ''} on '{ring_name}'")
+
+    # Files are paced at their native rate so readers see a camera-like stream
+    frame_interval = 1.0 / fps if is_file else 0.0
+    next_frame = time.time()
+    try:
+        while True:
+            if recorder is not None:
+                recorder.write(raw)
+            slot = ring.claim()
+            cv2.flip(raw, 1, dst=slot[0])
+            cv2.cvtColor(slot[0], cv2.COLOR_BGR2RGB, dst=slot[1])
+            ring.commit()
+
+            if frame_interval:
+                next_frame += frame_interval
+                delay = next_frame - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+            ret, raw = cap.read()
+            if not ret and is_file and loop:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, raw = cap.read()
+            if not ret:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+        ring.close()
+        if recorder is not None:
+            recorder.close()
+        print("📴 Camera broker stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared camera broker")
+    parser.add_argument("--source", default=CAMERA_SOURCE, help="camera index or video file")
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--loop", action="store_true", help="restart video files at the end")
+    parser.add_argument("--profile", default="broker", help="capture profile name or 'WxH@FPS FOURCC' spec")
+    parser.add_argument("--record", default=None, help="also save raw frames to a frame_record.py file")
+    args = parser.parse_args()
+    signal.signal(signal.SIGTERM, _stop)
+    run_broker(args.source, args.slots, args.loop, profile=args.profile, record=args.record)
@@ -0,0 +1,421 @@
+import os
+import threading
+import time
+import cv2
+import numpy as np
+from shm_ring import ShmRing
+from frame_record import FrameRecorder, ReplayCapture
+
+# Every vision module gets its frames through open_capture(): frames come back
+# already mirrored (BGR for drawing) together with the RGB copy MediaPipe wants.
+# If camera_broker.py is running the frames are read from its shared-memory ring,
+# otherwise the module opens the device itself like before. NEURO_REPLAY swaps the
+# camera for a frame_record.py recording, NEURO_RECORD saves what the device sees.
+
+FRAME_RING_NAME = "neuro_frames"
+CAMERA_SOURCE = os.environ.get("NEURO_CAMERA_SOURCE", "0")  # device index or video file
+FRAME_DEADLINE = float(os.environ.get("NEURO_FRAME_DEADLINE", "0.1"))  # seconds a frame may wait before it is dropped
+REPLAY_PATH = os.environ.get("NEURO_REPLAY")
+REPLAY_MODE = os.environ.get("NEURO_REPLAY_MODE", "fast")  # "fast" or "realtime"
+RECORD_PATH = os.environ.get("NEURO_RECORD")
+BROKER_WAIT = 5.0 if os.environ.get("NEURO_CAMERA_BROKER") else 0.0  # set by mainUI when it runs the broker
+
+# Per-module capture profiles: "WxH@FPS FOURCC", comma-separated fallbacks tried
+# in order. Override any of them with NEURO_PROFILE_<NAME>, e.g.
+#   NEURO_PROFILE_CURSOR="424x240@60 MJPG"
+# Behind camera_broker.py (always, when started from mainUI) the broker first
+# asks the device for one mode covering every module profile (the largest size
+# and highest rate any of them wants), then falls back to the "broker" entry;
+# each module's BrokerCapture then crops that stream to its profile's aspect
+# ratio and scales it down to the profile's size. NEURO_PROFILE_BROKER replaces
+# the broker's whole list.
+CAPTURE_PROFILES = {
+    "broker": "640x480@30 MJPG, 640x480@30",
+    "cursor": "640x360@60 MJPG, 640x360@30 MJPG, 640x480@30",
+    "levels": "640x480@30 MJPG, 640x480@30",
+    "blink": "640x480@30 MJPG, 640x480@30",
+    "keyboard": "640x360@30 MJPG, 640x480@30",
+    "face_unlock": "320x240, 640x480",
+}
+
+
+def parse_profile(spec):
+    candidates = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        size, _, fourcc = part.partition(" ")
+        size, _, fps = size.partition("@")
+        width, _, height = size.lower().partition("x")
+        candidates.append({
+            "width": int(width),
+            "height": int(height),
+            "fps": float(fps) if fps else None,
+            "fourcc": fourcc.strip() or None,
+        })
+    return candidates
+
+
+def profile_candidates(profile):
+    if profile is None:
+        return []
+    override = os.environ.get(f"NEURO_PROFILE_{profile.upper()}")
+    if override:
+        return parse_profile(override)
+    candidates = parse_profile(CAPTURE_PROFILES.get(profile, profile))
+    if profile == "broker":
+        candidates.insert(0, covering_mode())
+    return candidates
+
+
+def covering_mode():
+    # One mode that serves every module profile's first choice
+    wants = [profile_candidates(name)[0] for name in CAPTURE_PROFILES if name != "broker"]
+    fps = [want["fps"] for want in wants if want["fps"]]
+    fourcc = {want["fourcc"] for want in wants} - {None}
+    return {
+        "width": max(want["width"] for want in wants),
+        "height": max(want["height"] for want in wants),
+        "fps": max(fps) if fps else None,
+        "fourcc": "MJPG" if "MJPG" in fourcc else next(iter(fourcc), None),
+    }
+
+
+def _fourcc_name(code):
+    code = int(code)
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\0") or None
+
+
+def negotiate(cap, profile):
+    # Try each candidate until the device accepts the requested size, and record
+    # what it actually delivers so layouts can be derived from it.
+    accepted = None
+    for want in profile_candidates(profile):
+        if want["fourcc"]:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*want["fourcc"]))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, want["width"])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, want["height"])
+        if want["fps"]:
+            cap.set(cv2.CAP_PROP_FPS, want["fps"])
+        if (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))) == \
+                (want["width"], want["height"]):
+            accepted = want
+            break
+    return {
+        "profile": profile,
+        "requested": accepted,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "fourcc": _fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)),
+    }
+
+
+def parse_source(source=None):
+    source = CAMERA_SOURCE if source is None else source
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+class LocalCapture:
+    def __init__(self, source=None, profile=None, record=RECORD_PATH):
+        source = parse_source(source)
+        self.cap = cv2.VideoCapture(source)
+        # Video files keep their native format; only devices are negotiated
+        self.negotiated = negotiate(self.cap, None if isinstance(source, str) else profile)
+        self.recorder = FrameRecorder(record, {"negotiated": self.negotiated}) if record else None
+        self.frame = None
+        self.rgb = None
+        self.timestamp = 0.0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def read_frame(self):
+        ret, raw = self.cap.read()
+        if not ret:
+            return False, None, None
+        self.timestamp = time.time()
+        if self.recorder is not None:
+            self.recorder.write(raw, self.timestamp)
+        if self.frame is None or self.frame.shape != raw.shape:
+            self.frame = np.empty_like(raw)
+            self.rgb = np.empty_like(raw)
+        cv2.flip(raw, 1, dst=self.frame)
+        cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        return True, self.frame, self.rgb
+
+    def read(self):
+        ret, frame, _ = self.read_frame()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+def _fit(width, height, want):
+    # Centre crop (y0, y1, x0, x1) of a width x height frame with the aspect of
+    # `want`, and the size to scale it to; None if no smaller size is wanted
+    if want is None or want["width"] > width or want["height"] > height or \
+            (want["width"], want["height"]) == (width, height):
+        return None
+    crop_w = min(width, round(height * want["width"] / want["height"]))
+    crop_h = min(height, round(width * want["height"] / want["width"]))
+    x0, y0 = (width - crop_w) // 2, (height - crop_h) // 2
+    return (y0, y0 + crop_h, x0, x0 + crop_w), (want["width"], want["height"])
+
+
+class BrokerCapture:
+    def __init__(self, ring_name=FRAME_RING_NAME, timeout=2.0, profile=None):
+        self.ring = ShmRing.attach(ring_name)
+        self.timeout = timeout
+        self.last_seq = 0
+        self.timestamp = 0.0
+        _, h, w, c = self.ring.slot_shape
+        candidates = profile_candidates(profile)
+        # The broker negotiated once for everybody; a smaller profile is cut from its stream
+        self.fit = _fit(w, h, candidates[0] if candidates else None)
+        if self.fit is not None:
+            w, h = self.fit[1]
+        self.frame = np.empty((h, w, c), dtype=self.ring.dtype)
+        self.rgb = np.empty((h, w, c), dtype=self.ring.dtype)
+        self.fps = self.ring.info.get("fps", 0)
+        self.negotiated = dict(self.ring.info.get("negotiated", {}), width=w, height=h, fps=self.fps)
+        if self.fit is not None:
+            self.negotiated.update(profile=profile, scaled_from=f"{self.ring.slot_shape[2]}x{self.ring.slot_shape[1]}")
+
+    def isOpened(self):
+        return self.ring is not None
+
+    def get(self, prop):
+        h, w = self.frame.shape[:2]
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(w)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(h)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        return 0.0
+
+    def read_into(self, frame, rgb):
+        # Both halves are copied into private buffers before the slot is checked:
+        # a 4-slot ring at 30 fps reuses a slot within one inference, so a view
+        # could be torn or no longer match the BGR frame by the time it is used
+        while True:
+            item = self.ring.wait_next(self.last_seq, self.timeout)
+            if item is None:
+                return False
+            seq, self.timestamp, slot = item
+            if self.fit is None:
+                np.copyto(frame, slot[0])
+                np.copyto(rgb, slot[1])
+            else:
+                (y0, y1, x0, x1), size = self.fit
+                cv2.resize(slot[0, y0:y1, x0:x1], size, dst=frame, interpolation=cv2.INTER_AREA)
+                cv2.resize(slot[1, y0:y1, x0:x1], size, dst=rgb, interpolation=cv2.INTER_AREA)
+            if self.ring.still_valid(seq):
+                self.last_seq = seq
+                return True
+
+    def read_frame(self):
+        if not self.read_into(self.frame, self.rgb):
+            return False, None, None
+        return True, self.frame, self.rgb
+
+    def read(self):
+        ret, frame, _ = self.read_frame()
+        return ret, frame
+
+    def release(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+
+class LatestFrameGrabber:
+    # Reads the wrapped source on its own thread so the vision loop always gets
+    # the newest frame; anything older than max_age is dropped instead of queued.
+    def __init__(self, source, max_age=FRAME_DEADLINE, timeout=2.0):
+        self.source = source
+        self.max_age = max_age
+        self.timeout = timeout
+        self.timestamp = 0.0
+        self._buffers = [None, None, None]
+        self._latest = None
+        self._latest_seq = 0
+        self._latest_time = 0.0
+        self._held = None
+        self._consumed_seq = 0
+        self._ended = False
+        self._running = True
+        self._release_source = False  # release() timed out; the grab thread releases on exit
+        self._cond = threading.Condition()
+
+        self.frames_grabbed = 0
+        self.frames_overwritten = 0  # replaced before the loop asked for them
+        self.frames_expired = 0      # older than the deadline when the loop asked
+        self.frames_consumed = 0
+        self.last_age = 0.0
+        self.max_age_seen = 0.0
+        self._age_total = 0.0
+
+        self.negotiated = getattr(source, "negotiated", {})
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def frames_dropped(self):
+        return self.frames_overwritten + self.frames_expired
+
+    def _grab(self, buf):
+        # Into the back buffer; sources that copy anyway (the broker) write there directly
+        if hasattr(self.source, "read_into"):
+            if buf is None:
+                buf = (np.empty_like(self.source.frame), np.empty_like(self.source.rgb))
+            return buf if self.source.read_into(*buf) else None
+        ret, frame, rgb = self.source.read_frame()
+        if not ret:
+            return None
+        if buf is None or buf[0].shape != frame.shape:
+            buf = (np.empty_like(frame), np.empty_like(rgb))
+        np.copyto(buf[0], frame)
+        np.copyto(buf[1], rgb)
+        return buf
+
+    def _run(self):
+        try:
+            while self._running:
+                with self._cond:
+                    free = next(i for i in range(3) if i != self._latest and i != self._held)
+                buf = self._buffers[free] = self._grab(self._buffers[free])
+                if buf is None:
+                    break
+                stamp = getattr(self.source, "timestamp", 0.0) or time.time()
+                with self._cond:
+                    if self._latest_seq > self._consumed_seq:
+                        self.frames_overwritten += 1
+                    self._latest = free
+                    self._latest_seq += 1
+                    self._latest_time = stamp
+                    self.frames_grabbed += 1
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._ended = True
+                release = self._release_source
+                self._cond.notify_all()
+            if release:
+                self.source.release()
+
+    def isOpened(self):
+        # False once the grab thread has stopped, so callers stop retrying
+        return not self._ended and self.source.isOpened()
+
+    def get(self, prop):
+        return self.source.get(prop)
+
+    def read_frame(self):
+        deadline = time.time() + self.timeout
+        with self._cond:
+            while True:
+                if self._latest_seq > self._consumed_seq:
+                    age = time.time() - self._latest_time
+                    self._consumed_seq = self._latest_seq
+                    if self.max_age is None or age <= self.max_age:
+                        break
+                    self.frames_expired += 1
+                elif self._ended:
+                    return False, None, None
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False, None, None
+                self._cond.wait(remaining)
+            self._held = self._latest
+            self.timestamp = self._latest_time
+        self.frames_consumed += 1
+        self.last_age = age
+        self._age_total += age
+        self.max_age_seen = max(self.max_age_seen, age)
+        frame, rgb = self._buffers[self._held]
+        return True, frame, rgb
+
+    def read(self):
+        ret, frame, _ = self.read_frame()
+        return ret, frame
+
+    def stats(self):
+        consumed = self.frames_consumed or 1
+        return {
+            "grabbed": self.frames_grabbed,
+            "consumed": self.frames_consumed,
+            "dropped": self.frames_dropped,
+            "expired": self.frames_expired,
+            "last_age_ms": self.last_age * 1000,
+            "mean_age_ms": self._age_total / consumed * 1000,
+            "max_age_ms": self.max_age_seen * 1000,
+        }
+
+    def release(self):
+        # The source is only released once the grab thread is out of it; if it is
+        # still blocked in a read, the thread releases it on the way out
+        self._running = False
+        self._thread.join(timeout=1.0)
+        with self._cond:
+            if not self._ended:
+                self._release_source = True
+                return
+        self.source.release()
+
+
+def _attach_broker(stale_after, profile=None):
+    try:
+        broker = BrokerCapture(profile=profile)
+    except FileNotFoundError:
+        return None
+    item = broker.ring.latest()
+    fresh = item is not None and time.time() - item[1] < stale_after
+    del item
+    if fresh:
+        return broker
+    broker.release()  # ring left behind by a broker that died
+    return None
+
+
+def _open_source(source, profile, stale_after, wait):
+    # Attach to the resident broker when there is one; fall back to the device
+    if source is None:
+        deadline = time.time() + wait
+        while True:
+            broker = _attach_broker(stale_after, profile)
+            if broker is not None:
+                return broker
+            if time.time() >= deadline:
+                break
+            time.sleep(0.1)
+    return LocalCapture(source, profile)
+
+
+def open_capture(source=None, profile=None, threaded=False, max_age=FRAME_DEADLINE, stale_after=1.0,
+                 wait=BROKER_WAIT, replay=REPLAY_PATH, replay_mode=REPLAY_MODE):
+    if replay:
+        cap = ReplayCapture(replay, replay_mode)
+        # Fast replay is for deterministic runs: hand over every frame, drop nothing
+        threaded = threaded and replay_mode == "realtime"
+    else:
+        cap = _open_source(source, profile, stale_after, wait)
+    shared = isinstance(cap, BrokerCapture)
+    print(f"🎥 Capture {cap.negotiated.get('width')}x{cap.negotiated.get('height')}"
+          f"@{cap.negotiated.get('fps', 0):.0f} {cap.negotiated.get('fourcc') or ''} "
+          f"({'broker stream, ' if shared else ''}{profile or 'default'}"
+          f"{' scaled from ' + cap.negotiated['scaled_from'] if 'scaled_from' in cap.negotiated else ''})")
+    if threaded:
+        return LatestFrameGrabber(cap, max_age)
+    return cap
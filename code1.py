@@ -1,18 +1,25 @@
 import tkinter as tk
 from tkinter import ttk
-import pyautogui
 import multiprocessing
+import os
 import pygetwindow as gw
 import keyboard as kb
 import time
-import cv2
-import mediapipe as mp
 import subprocess
+from capture import open_capture
+from landmarks import HandArrays, pinch_distances, INDEX_TIP
+from model_modes import graph_for
+from gesture_engine import GestureEngine, GestureMachine, T
+from key_inject import make_injector, tap, chord, text_events, KEY_CODES
+from audio_capture import start_audio, subscribe, AUDIO_RING_NAME
+from speech_backend import SpeechListener, make_recognizer
 
 modifier_keys = {"Shift": False, "Ctrl": False, "Alt": False}
 modifier_buttons = {}
 win_key_press_time = None
 button_map = {}
+injector = make_injector()  # each key press goes out as one batch (key_inject.py)
+voice_requests = None  # queue to the resident voice-typing process
 
 shift_map = {
     '`': '~', '1': '!', '2': '@', '3': '#', '4': '$', '5': '%',
@@ -43,26 +50,26 @@ def press_key(k):
 
     if k == "Win":
         if win_key_press_time and (time.time() - win_key_press_time) < 0.4:
-            pyautogui.press('win')
+            injector.send(tap('win'))
             win_key_press_time = None
         else:
             win_key_press_time = time.time()
         return
 
     special_keys = {
-        'Caps': 'caps lock', 'Back': 'backspace', 'Delete': 'delete',
+        'Caps': 'capslock', 'Back': 'backspace', 'Delete': 'delete',
         'Tab': 'tab', 'Enter': 'enter', 'Space': 'space',
         'Esc': 'esc', 'PrtSc': 'printscreen'
     }
 
     if k in special_keys:
-        pyautogui.press(special_keys[k])
+        injector.send(tap(special_keys[k]))
         return
     if k == 'Voice':
-        multiprocessing.Process(target=voice_typing).start()
+        start_voice_worker().put(True)
         return
     if k in ['Left', 'Right', 'Up', 'Down']:
-        pyautogui.press(k.lower())
+        injector.send(tap(k.lower()))
         return
 
     send_key = k
@@ -75,25 +82,49 @@ def press_key(k):
             send_key = k.lower()
 
     mods = [mod.lower() for mod in modifier_keys if modifier_keys[mod]]
+    if send_key.lower() in KEY_CODES:  # F1-F12
+        send_key = send_key.lower()
     if mods:
-        pyautogui.hotkey(*mods, send_key.lower())
+        injector.send(chord(*mods, send_key.lower()))
+    elif send_key in KEY_CODES:
+        injector.send(tap(send_key))
     else:
-        pyautogui.write(send_key)
+        injector.send(text_events(send_key))
 
     if modifier_keys['Shift']:
         modifier_keys['Shift'] = False
         modifier_buttons['Shift'].config(bg="gray")
 
-def voice_typing():
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        try:
-            print("Listening...")
-            audio = recognizer.listen(source, timeout=10)
-            text = recognizer.recognize_google(audio)
-            pyautogui.typewrite(text + " ")
-        except Exception as e:
-            print("Voice typing error:", e)
+def start_voice_worker():
+    # One resident voice-typing process per keyboard, started on the first Voice press
+    global voice_requests
+    if voice_requests is None:
+        voice_requests = multiprocessing.Queue()
+        multiprocessing.Process(target=voice_worker, args=(voice_requests,), daemon=True).start()
+    return voice_requests
+
+def voice_worker(requests):
+    # The recogniser is built once: loading a Vosk model takes seconds
+    listener = SpeechListener(make_recognizer(), timeout=10)
+    while requests.get():
+        voice_typing(listener)
+
+def voice_typing(listener):
+    # Shares the assistant's microphone when it is running, else captures just for
+    # this phrase on a private ring, so the assistant never attaches to it
+    capture = start_audio(private_ring=f"{AUDIO_RING_NAME}_typing_{os.getpid()}")
+    frames = subscribe(capture.ring_name if capture is not None else AUDIO_RING_NAME)
+    try:
+        print("Listening...")
+        text = listener.listen(frames)
+        if text:
+            injector.send(text_events(text + " "))
+    except Exception as e:
+        print("Voice typing error:", e)
+    finally:
+        frames.close()
+        if capture is not None:
+            capture.close()
 
 def create_keyboard(root, frame):
     for row in keys:
@@ -121,34 +152,39 @@ def create_keyboard(root, frame):
                 modifier_buttons[key] = btn
                 btn.config(bg="gray")
 
+# Window drag: pinch on the top strip for 5 s to pick the keyboard up, release to drop it.
+# Frame context is (x, y, pinch) in screen pixels (gesture_engine.py)
+def drag_engine():
+    in_strip = lambda f: f.ctx[1] < 100 and f.ctx[2]
+    return GestureEngine({}, [
+        GestureMachine("drag", [
+            T("idle", "holding", when=in_strip),
+            T("holding", "idle", when=lambda f: not in_strip(f)),
+            T("holding", "dragging", after=5),
+            T("dragging", "idle", when=lambda f: not f.ctx[2]),
+        ]),
+    ])
+
 def camera_process(pipe_conn):
-    mp_hands = mp.solutions.hands
-    cap = cv2.VideoCapture(0)
-    drag_start_time = None
-    dragging = False
-    with mp_hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5) as hands:
+    cap = open_capture(profile="keyboard", threaded=True)
+    hand_arrays = HandArrays(max_hands=1)
+    gestures = drag_engine()
+    with graph_for("keyboard") as hands:
         while True:
-            ret, frame = cap.read()
+            ret, frame, rgb = cap.read_frame()
             if not ret:
                 break
-            frame = cv2.flip(frame, 1)
-            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            results = hands.process(rgb)
             if results.multi_hand_landmarks:
-                hand_landmarks = results.multi_hand_landmarks[0]
-                index_tip = hand_landmarks.landmark[8]
-                thumb_tip = hand_landmarks.landmark[4]
+                pts = hand_arrays.fill(results)  # normalised (1, 21, 3)
+                index_x, index_y = pts[0, INDEX_TIP, :2]
 
-                x, y = int(index_tip.x * 1920), int(index_tip.y * 1080)
-                dist = ((index_tip.x - thumb_tip.x) ** 2 + (index_tip.y - thumb_tip.y) ** 2) ** 0.5
+                x, y = int(index_x * 1920), int(index_y * 1080)
+                dist = float(pinch_distances(pts)[0])
 
                 pinch = dist < 0.05
-                if y < 100 and pinch:
-                    if drag_start_time is None:
-                        drag_start_time = time.time()
-                    elif time.time() - drag_start_time > 5:
-                        dragging = True
-                else:
-                    drag_start_time = None
+                gestures.step((x, y, pinch))
+                dragging = gestures.state("drag") == "dragging"
 
                 pipe_conn.send((x, y, pinch, dragging))
             else:
@@ -0,0 +1,140 @@
+import re
+from collections import deque, namedtuple
+
+# Voice-command dispatch: commands declare trigger phrases, and every phrase is
+# compiled into one Aho-Corasick automaton over words, so a transcript is
+# scanned once however many commands there are. Phrases match whole words
+# ("time" no longer fires on "sometimes") and the longest match wins ("you can
+# sleep" beats "sleep"); ties go to the command registered first.
+#
+#   registry = CommandRegistry(fallback=web_search)
+#   registry.add("time", ["time", "what time is it"], tell_time)
+#   registry.add("wikipedia", ["wikipedia {query}", "search wikipedia for {query}"], wiki)
+#   registry.add("restart", ["restart", "restart the computer"], restart, exact=True)
+#   registry.dispatch("search wikipedia for alan turing")   # -> wiki(query="alan turing")
+#
+# A {slot} in a phrase receives the rest of the transcript: the words on either
+# side of the match. exact=True commands only fire when the phrase is the whole
+# transcript, give or take FILLER words.
+
+# Politeness and padding around a request: "can you restart the computer for me"
+# still counts as the whole of "restart"; "how do i restart my router" does not
+FILLER = {"please", "jarvis", "hey", "ok", "okay", "now", "quickly", "can", "could", "would",
+          "will", "you", "for", "me", "the", "my", "this", "computer", "pc", "laptop", "system"}
+SLOT = re.compile(r"^\{(\w+)\}$")
+WORD = re.compile(r"[a-z0-9']+")
+
+Pattern = namedtuple("Pattern", "name words slot handler exact order")
+Match = namedtuple("Match", "name handler slots start end")
+
+
+def tokenize(text):
+    return WORD.findall(text.lower())
+
+
+class CommandRegistry:
+    def __init__(self, fallback=None, filler=FILLER):
+        self.fallback = fallback
+        self.filler = set(filler)
+        self.patterns = []
+        self.names = []
+        self._moves = None
+
+    def add(self, name, phrases, handler, exact=False):
+        if name in self.names:
+            raise ValueError(f"command {name!r} registered twice")
+        self.names.append(name)
+        for phrase in phrases:
+            words, slot = [], None
+            for token in phrase.split():
+                found = SLOT.match(token)
+                if found:
+                    slot = found.group(1)
+                else:
+                    words += tokenize(token)
+            if not words:
+                raise ValueError(f"{name}: phrase {phrase!r} has no words to match")
+            self.patterns.append(Pattern(name, tuple(words), slot, handler, exact, len(self.names)))
+        self._moves = None  # recompiled on the next match
+
+    def command(self, *phrases, name=None, exact=False):
+        # Decorator form of add()
+        def register(handler):
+            self.add(name or handler.__name__, phrases, handler, exact)
+            return handler
+        return register
+
+    def compile(self):
+        goto, fail, out = [{}], [0], [[]]
+        for pattern in self.patterns:
+            state = 0
+            for word in pattern.words:
+                if word not in goto[state]:
+                    goto.append({})
+                    fail.append(0)
+                    out.append([])
+                    goto[state][word] = len(goto) - 1
+                state = goto[state][word]
+            out[state].append(pattern)
+        # Breadth-first fail links; each state also reports what its fail chain ends in
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in goto[state].items():
+                queue.append(child)
+                back = fail[state]
+                while back and word not in goto[back]:
+                    back = fail[back]
+                fail[child] = goto[back].get(word, 0)
+                out[child] += out[fail[child]]
+        # Fold the fail chains into the transitions so matching never walks them.
+        # Transitions that land where the root would go are left out; the
+        # matcher falls back to the root's table for those.
+        moves = [goto[0]] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            moves[state] = dict(moves[fail[state]]) if fail[state] else {}
+            moves[state].update(goto[state])
+            queue.extend(goto[state].values())
+        for patterns in out:
+            patterns.sort(key=lambda p: (-len(p.words), p.order))
+        self._moves, self._out = moves, out
+
+    def _whole(self, tokens, start, end):
+        return all(t in self.filler for t in tokens[:start]) and all(t in self.filler for t in tokens[end:])
+
+    def match(self, text):
+        # The longest phrase found in the transcript, or None
+        if self._moves is None:
+            self.compile()
+        moves, out = self._moves, self._out
+        root = moves[0]
+        tokens = tokenize(text)
+        best, best_key = None, None
+        state = 0
+        for i, word in enumerate(tokens):
+            state = moves[state].get(word) or root.get(word, 0)
+            # Sorted longest first: the first usable pattern is the best ending here
+            for pattern in out[state]:
+                start = i + 1 - len(pattern.words)
+                if pattern.exact and not self._whole(tokens, start, i + 1):
+                    continue
+                key = (len(pattern.words), -pattern.order, -start)
+                if best_key is None or key > best_key:
+                    best, best_key = (pattern, start, i + 1), key
+                break
+        if best is None:
+            return None
+        pattern, start, end = best
+        slots = {pattern.slot: " ".join(tokens[:start] + tokens[end:])} if pattern.slot else {}
+        return Match(pattern.name, pattern.handler, slots, start, end)
+
+    def dispatch(self, text):
+        # Runs the matching command (or the fallback with the whole transcript)
+        match = self.match(text)
+        if match is not None:
+            match.handler(**match.slots)
+        elif self.fallback is not None:
+            self.fallback(text)
+        return match
@@ -0,0 +1,123 @@
+import math
+import os
+import numpy as np
+
+# Cursor filter stage between the hand tracker and the pointer. Every filter
+# takes timestamped targets with update(point, t) and answers position(now);
+# t is the capture time of the frame, so a predicting filter can extrapolate
+# across the capture + inference latency as well as between frames.
+#
+#   legacy   prev + (target - prev) // 3, the original smoothing
+#   oneeuro  One Euro filter: heavy smoothing at rest, little lag when moving
+#   predict  One Euro plus constant-velocity prediction up to `now`
+#
+# Pick one with NEURO_CURSOR_FILTER; compare them with
+#   python benchmarks.py cursor session.nfr   (or --synthetic)
+
+CURSOR_FILTER = os.environ.get("NEURO_CURSOR_FILTER", "predict")
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class FrameInterval:
+    # Running estimate of the time between frames; gaps (hand lost, idle tier)
+    # are not allowed to drag it up
+    def __init__(self, initial=1 / 30, weight=0.1):
+        self.value = initial
+        self.weight = weight
+
+    def update(self, dt):
+        if 0 < dt < 4 * self.value:
+            self.value += self.weight * (dt - self.value)
+        return self.value
+
+
+class IntegerSmoothing:
+    def __init__(self, smoothing=3):
+        self.smoothing = smoothing
+        self.point = np.zeros(2, np.int64)
+
+    def reset(self):
+        pass  # the original never reset: the pointer glides from where it was
+
+    def update(self, point, t):
+        target = np.asarray(point, np.int64)
+        self.point = self.point + (target - self.point) // self.smoothing
+        return self.point
+
+    def position(self, now=None):
+        return self.point
+
+
+class OneEuroFilter:
+    # Casiez et al., "1 Euro Filter" (CHI 2012), on both axes at once. The
+    # cutoff rises with speed: min_cutoff sets jitter at rest, beta the lag
+    # while moving. dt comes from the frame timestamps.
+    def __init__(self, min_cutoff=0.5, beta=0.02, d_cutoff=1.0, reset_after=4.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset_after = reset_after  # gap, in frame intervals, that restarts the filter
+        self.interval = FrameInterval()
+        self.reset()
+
+    def reset(self):
+        self.point = None
+        self.velocity = np.zeros(2)
+        self.t = None
+
+    def update(self, point, t):
+        point = np.asarray(point, np.float64)
+        if self.point is None or t - self.t > self.reset_after * self.interval.value:
+            self.point, self.velocity, self.t = point, np.zeros(2), t
+            return self.point
+        dt = t - self.t
+        if dt <= 0:
+            dt = self.interval.value
+        else:
+            self.interval.update(dt)
+        velocity = (point - self.point) / dt
+        self.velocity += _alpha(self.d_cutoff, dt) * (velocity - self.velocity)
+        cutoff = self.min_cutoff + self.beta * float(np.hypot(*self.velocity))
+        self.point = self.point + _alpha(cutoff, dt) * (point - self.point)
+        self.t = t
+        return self.point
+
+    def position(self, now=None):
+        return self.point
+
+
+class PredictiveFilter(OneEuroFilter):
+    # Extrapolates the filtered point along its smoothed velocity to `now`. The
+    # look-ahead is capped at max_lead frame intervals so a stalled tracker
+    # cannot fling the pointer, and slow motion (below min_speed px/s) is not
+    # extrapolated at all so a resting hand stays put.
+    predicts = True
+
+    def __init__(self, max_lead=2.0, min_speed=40.0, **kwargs):
+        super().__init__(**kwargs)
+        self.max_lead = max_lead
+        self.min_speed = min_speed
+
+    def position(self, now=None):
+        if self.point is None or now is None:
+            return self.point
+        speed = float(np.hypot(*self.velocity))
+        if speed < self.min_speed:
+            return self.point
+        lead = min(max(now - self.t, 0.0), self.max_lead * self.interval.value)
+        return self.point + self.velocity * lead
+
+
+FILTERS = {
+    "legacy": IntegerSmoothing,
+    "oneeuro": OneEuroFilter,
+    "predict": PredictiveFilter,
+}
+
+
+def make_filter(name=None, **kwargs):
+    return FILTERS[name or CURSOR_FILTER](**kwargs)
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+import numpy as np
+from cursor_filter import FrameInterval
+
+# Drives the pointer from its own thread at CURSOR_RATE Hz, so its smoothness no
+# longer depends on how fast frames are inferred. The vision loop hands in
+# timestamped targets with update(); every tick asks the filter where the pointer
+# should be *now*. A predicting filter extrapolates by itself; for the others
+# the thread glides from the last shown point to the newest target over one
+# measured frame interval. NEURO_CURSOR_RATE=0 moves once per frame as before.
+
+CURSOR_RATE = float(os.environ.get("NEURO_CURSOR_RATE", "120"))
+
+
+class CursorOutput:
+    def __init__(self, cursor_filter, move, rate=CURSOR_RATE):
+        self.filter = cursor_filter
+        self.move = move  # called with integer (x, y) from the output thread
+        self.period = 1.0 / rate
+        self.interpolate = not getattr(cursor_filter, "predicts", False)
+        self.interval = FrameInterval()
+        self.lock = threading.Lock()
+        self.glide_from = self.glide_to = None
+        self.glide_start = 0.0
+        self.last_update = None
+        self.shown = None
+        self.updates = 0
+        self.ticks = 0
+        self.moves = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def update(self, point, t):
+        with self.lock:
+            self.filter.update(point, t)
+            now = time.time()
+            if self.last_update is not None:
+                self.interval.update(now - self.last_update)
+            self.last_update = now
+            self.glide_from = np.asarray(self.shown if self.shown is not None else self.filter.position(now), np.float64)
+            self.glide_to = np.asarray(self.filter.position(now), np.float64)
+            self.glide_start = now
+            self.updates += 1
+
+    def _target(self, now):
+        if self.glide_to is None:
+            return None
+        if not self.interpolate:
+            return self.filter.position(now)
+        progress = min((now - self.glide_start) / self.interval.value, 1.0)
+        return self.glide_from + (self.glide_to - self.glide_from) * progress
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while self.running:
+            with self.lock:
+                target = self._target(time.time())
+            self.ticks += 1
+            if target is not None:
+                point = (int(target[0]), int(target[1]))
+                if point != self.shown:
+                    # Only move when the pixel changes, so a physical mouse still works at rest
+                    self.move(point)
+                    self.shown = point
+                    self.moves += 1
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # fell behind: don't burst to catch up
+
+    def stats(self):
+        return {"updates": self.updates, "ticks": self.ticks, "moves": self.moves,
+                "frame_interval_ms": round(self.interval.value * 1000, 1)}
+
+    def close(self):
+        self.running = False
+        self.thread.join(timeout=1.0)
@@ -1,5 +1,7 @@
 import cv2, os, time, ctypes, numpy as np
 from cryptography.fernet import Fernet
+from capture import open_capture
+from key_inject import make_injector, text_events, tap
 
 # Hide console window (for Windows)
 ctypes.windll.user32.ShowWindow(ctypes.windll.kernel32.GetConsoleWindow(), 0)
@@ -19,34 +21,12 @@ os.makedirs(DATA_DIR, exist_ok=True)
 face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
 recognizer = cv2.face.LBPHFaceRecognizer_create()
 
-# ─── Windows Keyboard Input Setup ──────────────────────────────────────
-PUL = ctypes.POINTER(ctypes.c_ulong)
-
-class KEYBDINPUT(ctypes.Structure):
-    _fields_ = [("wVk", ctypes.c_ushort), ("wScan", ctypes.c_ushort),
-                ("dwFlags", ctypes.c_ulong), ("time", ctypes.c_ulong),
-                ("dwExtraInfo", PUL)]
-
-class INPUT(ctypes.Structure):
-    _fields_ = [("type", ctypes.c_ulong), ("ki", KEYBDINPUT)]
-
-SendInput = ctypes.windll.user32.SendInput
-KEYEVENTF_UNICODE, KEYEVENTF_KEYUP, INPUT_KEYBOARD = 0x0004, 0x0002, 1
-
-def _press_unicode(code: int, up=False):
-    flags = KEYEVENTF_UNICODE | (KEYEVENTF_KEYUP if up else 0)
-    inp = INPUT(type=INPUT_KEYBOARD,
-                ki=KEYBDINPUT(0, code, flags, 0, None))
-    SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+# ─── Keyboard Injection ────────────────────────────────────────────────
+injector = make_injector()  # SendInput on Windows, one batch per call (key_inject.py)
 
 def type_password(text: str):
     ctypes.windll.user32.SetForegroundWindow(ctypes.windll.user32.GetForegroundWindow())
-    for ch in text:
-        _press_unicode(ord(ch))
-        _press_unicode(ord(ch), up=True)
-        time.sleep(0.01)
-    _press_unicode(0x0D)  # Press Enter
-    _press_unicode(0x0D, up=True)
+    injector.send(text_events(text) + tap("enter"))
 
 # ─── Password Management ───────────────────────────────────────────────
 def encrypt_password():
@@ -77,13 +57,16 @@ def register_owner():
     if not os.path.exists(KEY_PATH) or not os.path.exists(PASSWORD_PATH):
         encrypt_password()
 
-    cap = cv2.VideoCapture(0)
+    cap = open_capture(profile="face_unlock")
     count = 0
     print("[📸] Look at the camera to register…")
 
     while count < CAPTURES:
         ok, frame = cap.read()
         if not ok:
+            if not cap.isOpened():  # a replay ran out, or the camera went away
+                print(f"[❗] Capture ended after {count}/{CAPTURES} images.")
+                break
             continue
 
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
@@ -91,7 +74,7 @@ def register_owner():
 
         for x, y, w, h in faces:
             count += 1
-            face_img = gray[y:y + h, x:x + w]
+            face_img = cv2.flip(gray[y:y + h, x:x + w], 1)  # capture frames are mirrored
             filename = f"{DATA_DIR}/user.{USER_ID}.{count}.jpg"
             cv2.imwrite(filename, face_img)
             print(f"[📸] Captured image {count}/{CAPTURES}")
@@ -100,7 +83,8 @@ def register_owner():
 
     cap.release()
     cv2.destroyAllWindows()
-    train_model()
+    if count:
+        train_model()
 
 def train_model():
     print("[🧠] Training model...")
@@ -131,18 +115,22 @@ def recognise_owner():
         register_owner()
 
     recognizer.read(MODEL_PATH)
-    cap = cv2.VideoCapture(0)
+    cap = open_capture(profile="face_unlock")
     attempts = 0
     print("[🔒] Looking for the owner...")
 
     while attempts < MAX_ATTEMPTS:
         ok, frame = cap.read()
-        if not ok: continue
+        if not ok:
+            if not cap.isOpened():
+                print("[❗] Capture ended before the owner was recognised.")
+                break
+            continue
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         faces = face_cascade.detectMultiScale(gray, 1.3, 5)
 
         for x, y, w, h in faces:
-            roi = gray[y:y + h, x:x + w]
+            roi = cv2.flip(gray[y:y + h, x:x + w], 1)
             label, conf = recognizer.predict(roi)
             print(f"[⚠️] Detected face — Confidence: {conf:.2f}")
 
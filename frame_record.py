@@ -0,0 +1,175 @@
+import argparse
+import json
+import struct
+import time
+import zlib
+import cv2
+import numpy as np
+
+# Compact recording of raw (un-mirrored) camera frames plus capture timestamps,
+# so every vision module can be replayed offline through capture.open_capture().
+#
+#   python frame_record.py record session.nfr --seconds 20
+#   python frame_record.py info session.nfr
+#   NEURO_REPLAY=session.nfr NEURO_REPLAY_MODE=realtime python "mouse control.py"
+#
+# File layout: b"NFR1" | u32 header length | JSON header | frames...
+# Each frame: f64 timestamp | u32 height | u32 width | u32 channels | u32 size | zlib(BGR bytes)
+
+MAGIC = b"NFR1"
+FRAME_HEADER = struct.Struct("<dIIII")
+
+
+class FrameRecorder:
+    def __init__(self, path, info=None, level=1):
+        self.file = open(path, "wb")
+        self.level = level
+        self.frames = 0
+        header = json.dumps(info or {}).encode()
+        self.file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write(self, frame, timestamp=None):
+        h, w = frame.shape[:2]
+        c = frame.shape[2] if frame.ndim == 3 else 1
+        data = zlib.compress(np.ascontiguousarray(frame).tobytes(), self.level)
+        stamp = time.time() if timestamp is None else timestamp
+        self.file.write(FRAME_HEADER.pack(stamp, h, w, c, len(data)))
+        self.file.write(data)
+        self.frames += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_header(f):
+    if f.read(4) != MAGIC:
+        raise ValueError("not a frame recording")
+    (size,) = struct.unpack("<I", f.read(4))
+    return json.loads(f.read(size).decode())
+
+
+def iter_frames(path):
+    with open(path, "rb") as f:
+        read_header(f)
+        while True:
+            head = f.read(FRAME_HEADER.size)
+            if len(head) < FRAME_HEADER.size:
+                return
+            stamp, h, w, c, size = FRAME_HEADER.unpack(head)
+            raw = np.frombuffer(zlib.decompress(f.read(size)), dtype=np.uint8)
+            yield stamp, raw.reshape((h, w, c) if c > 1 else (h, w))
+
+
+class ReplayCapture:
+    # Drop-in capture source that plays a recording back, either as fast as the
+    # consumer reads ("fast") or paced by the recorded timestamps ("realtime").
+    def __init__(self, path, mode="fast"):
+        self.path = path
+        self.realtime = mode == "realtime"
+        with open(path, "rb") as f:
+            self.info = read_header(f)
+        self.negotiated = dict(self.info.get("negotiated", {}), profile="replay")
+        self.frames = iter_frames(path)
+        self.frame = None
+        self.rgb = None
+        self.timestamp = 0.0
+        self.frame_time = 0.0  # timestamp stored in the recording
+        self.frame_index = -1
+        self._start_wall = None
+        self._start_rec = None
+        self._opened = True
+
+    def isOpened(self):
+        return self._opened
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.negotiated.get("width", 0))
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.negotiated.get("height", 0))
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.negotiated.get("fps", 0))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frame_index + 1)
+        return 0.0
+
+    def read_frame(self):
+        item = next(self.frames, None) if self._opened else None
+        if item is None:
+            self._opened = False
+            return False, None, None
+        stamp, raw = item
+        if self.realtime:
+            if self._start_wall is None:
+                self._start_wall, self._start_rec = time.time(), stamp
+            delay = (stamp - self._start_rec) - (time.time() - self._start_wall)
+            if delay > 0:
+                time.sleep(delay)
+        self.frame_index += 1
+        self.frame_time = stamp
+        self.timestamp = time.time()
+        if raw.ndim == 2:
+            # Grey recordings play back as BGR, like every camera source
+            raw = cv2.cvtColor(raw, cv2.COLOR_GRAY2BGR)
+        if self.frame is None or self.frame.shape != raw.shape:
+            self.frame = np.empty_like(raw)
+            self.rgb = np.empty_like(raw)
+        cv2.flip(raw, 1, dst=self.frame)
+        cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        return True, self.frame, self.rgb
+
+    def read(self):
+        ret, frame, _ = self.read_frame()
+        return ret, frame
+
+    def release(self):
+        self._opened = False
+        self.frames.close()
+
+
+def record(path, source=None, seconds=10.0, profile="broker"):
+    from capture import LocalCapture
+    cap = LocalCapture(source, profile, record=path)
+    print(f"⏺️ Recording {cap.negotiated['width']}x{cap.negotiated['height']} to {path} for {seconds:.0f}s")
+    end = time.time() + seconds
+    try:
+        while time.time() < end:
+            ret, _, _ = cap.read_frame()
+            if not ret:
+                break
+    except KeyboardInterrupt:
+        pass
+    frames = cap.recorder.frames
+    cap.release()
+    print(f"✅ Saved {frames} frames")
+
+
+def info(path):
+    with open(path, "rb") as f:
+        header = read_header(f)
+    count, first, last = 0, None, None
+    for stamp, _ in iter_frames(path):
+        first = stamp if first is None else first
+        last = stamp
+        count += 1
+    duration = (last - first) if count > 1 else 0.0
+    print(json.dumps(header))
+    print(f"{count} frames, {duration:.2f}s, {count / duration if duration else 0:.1f} fps")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or inspect camera frame recordings")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("path")
+    rec.add_argument("--source", default=None, help="camera index or video file")
+    rec.add_argument("--seconds", type=float, default=10.0)
+    rec.add_argument("--profile", default="broker")
+    show = sub.add_parser("info")
+    show.add_argument("path")
+    args = parser.parse_args()
+    if args.cmd == "record":
+        record(args.path, args.source, args.seconds, args.profile)
+    else:
+        info(args.path)
@@ -0,0 +1,106 @@
+import time
+from collections import namedtuple
+
+# Table-driven gestures. A gesture is a small state machine whose transitions
+# are declared as data: (source state, target state, condition, action, minimum
+# time in the source state). Conditions read named features (distances, pinch
+# flags, ...) that are computed lazily at most once per frame and shared by every
+# machine. Machines whose guard is false are not stepped at all.
+#
+#   engine = GestureEngine(FEATURES, [
+#       GestureMachine("pinch", [
+#           T("idle", "held", when=lambda f: f["pinch"] < 30),
+#           T("held", "idle", when=lambda f: f["pinch"] >= 30, do=click),
+#       ], guard=lambda f: f["hands"] == 1),
+#   ])
+#   engine.step(context)            # once per frame
+
+Transition = namedtuple("Transition", "source target when do after")
+
+
+def T(source, target, when=None, do=None, after=0.0):
+    # `after`: seconds the machine must have been in `source` before this can fire.
+    # A transition back to the same state restarts that clock (repeat gestures).
+    return Transition(source, target, when, do, after)
+
+
+class Features:
+    # Per-frame feature cache: f["name"] runs table["name"](f) the first time it
+    # is asked for in a frame. f.ctx is the frame context, f.engine the engine.
+    def __init__(self, table, engine):
+        self.table = table
+        self.engine = engine
+        self.values = {}
+        self.ctx = None
+        self.now = 0.0
+
+    def begin(self, ctx, now):
+        self.ctx = ctx
+        self.now = now
+        self.values.clear()
+
+    def __getitem__(self, name):
+        try:
+            return self.values[name]
+        except KeyError:
+            value = self.values[name] = self.table[name](self)
+            return value
+
+
+class GestureMachine:
+    def __init__(self, name, transitions, initial="idle", guard=None, reset_when=None, on_reset=None):
+        self.name = name
+        self.initial = initial
+        self.guard = guard            # step only while this holds (None: always)
+        self.reset_when = reset_when  # with the guard off, go back to `initial` when this holds
+        self.on_reset = on_reset      # called as on_reset(f, state) before a reset
+        self.table = {}
+        for t in transitions:
+            self.table.setdefault(t.source, []).append(t)
+        self.state = initial
+        self.entered = 0.0
+
+    def step(self, f):
+        for t in self.table.get(self.state, ()):
+            if f.now - self.entered < t.after:
+                continue
+            if t.when is None or t.when(f):
+                if t.do is not None:
+                    t.do(f)
+                self.state = t.target
+                self.entered = f.now
+                return True
+        return False
+
+    def reset(self, f):
+        if self.state != self.initial:
+            if self.on_reset is not None:
+                self.on_reset(f, self.state)
+            self.state = self.initial
+            self.entered = f.now
+
+
+class GestureEngine:
+    def __init__(self, features, machines):
+        self.features = Features(features, self)
+        self.machines = list(machines)
+        self.by_name = {m.name: m for m in self.machines}
+        self.frames = 0
+        self.stepped = 0
+
+    def state(self, name):
+        return self.by_name[name].state
+
+    def step(self, ctx, now=None):
+        f = self.features
+        f.begin(ctx, time.time() if now is None else now)
+        self.frames += 1
+        fired = []
+        for m in self.machines:
+            if m.guard is None or m.guard(f):
+                self.stepped += 1
+                if m.step(f):
+                    fired.append(m.name)
+            elif m.reset_when is not None and m.reset_when(f):
+                m.reset(f)
+        return fired
@@ -0,0 +1,205 @@
+import cv2
+import numpy as np
+
+# Cheaper MediaPipe Hands inference for the capture loops.
+#
+# RoiHandTracker runs the model on a padded crop around the hands found in the
+# previous frame and only goes back to the full frame when tracking gets shaky.
+# Results are returned in full-frame normalised coordinates, so callers (and
+# mp_drawing) can't tell which path produced them.
+#
+# FlowHandTracker runs real inference only every N frames and moves the last
+# landmarks along with pyramidal Lucas-Kanade optical flow in between.
+
+
+def landmark_bbox(results):
+    xs, ys = [], []
+    for hand in results.multi_hand_landmarks:
+        for lm in hand.landmark:
+            xs.append(lm.x)
+            ys.append(lm.y)
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class RoiHandTracker:
+    def __init__(self, hands, roi_hands=None, enabled=True, pad=0.5, min_size=160,
+                 max_area=0.6, min_score=0.8, edge=0.02, refresh_every=30):
+        self.hands = hands                  # full-frame graph
+        self.roi_hands = roi_hands or hands  # graph fed with crops (keeps its own tracking state)
+        self.enabled = enabled
+        self.pad = pad                      # padding around the bbox, fraction of its size
+        self.min_size = min_size            # smallest crop side in pixels
+        self.max_area = max_area            # crops bigger than this share of the frame aren't worth it
+        self.min_score = min_score          # handedness score below this counts as lost
+        self.edge = edge                    # landmarks this close to the crop border = hand leaving
+        self.refresh_every = refresh_every  # periodic full frame so new hands are picked up
+        self.roi = None
+        self.hand_count = 0
+        self.since_full = 0
+
+        self.frames = 0
+        self.roi_frames = 0
+        self.fallbacks = 0
+        self.fallback_reasons = {}
+
+    @property
+    def fallback_rate(self):
+        return self.fallbacks / self.roi_frames if self.roi_frames else 0.0
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "roi_frames": self.roi_frames,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": round(self.fallback_rate, 3),
+            "reasons": dict(self.fallback_reasons),
+        }
+
+    def _fallback(self, reason):
+        self.fallbacks += 1
+        self.fallback_reasons[reason] = self.fallback_reasons.get(reason, 0) + 1
+
+    def _next_roi(self, results, w, h):
+        if not results.multi_hand_landmarks:
+            return None
+        x0, y0, x1, y1 = landmark_bbox(results)
+        bw, bh = (x1 - x0) * w, (y1 - y0) * h
+        side_w = max(bw * (1 + 2 * self.pad), self.min_size)
+        side_h = max(bh * (1 + 2 * self.pad), self.min_size)
+        cx, cy = (x0 + x1) / 2 * w, (y0 + y1) / 2 * h
+        rx0, ry0 = int(max(0, cx - side_w / 2)), int(max(0, cy - side_h / 2))
+        rx1, ry1 = int(min(w, cx + side_w / 2)), int(min(h, cy + side_h / 2))
+        # Landmarks can fall outside the frame, which may leave nothing to crop
+        if rx1 - rx0 < self.min_size // 2 or ry1 - ry0 < self.min_size // 2:
+            return None
+        if (rx1 - rx0) * (ry1 - ry0) > self.max_area * w * h:
+            return None
+        return rx0, ry0, rx1, ry1
+
+    def _lost(self, results, roi, w, h):
+        if not results.multi_hand_landmarks:
+            return "no_hand"
+        if len(results.multi_hand_landmarks) < self.hand_count:
+            return "hand_count"
+        for handedness in results.multi_handedness:
+            if handedness.classification[0].score < self.min_score:
+                return "low_score"
+        # Touching a crop border that isn't also the frame border means the hand is leaving
+        rx0, ry0, rx1, ry1 = roi
+        x0, y0, x1, y1 = landmark_bbox(results)
+        if (x0 < self.edge and rx0 > 0) or (y0 < self.edge and ry0 > 0) or \
+                (x1 > 1 - self.edge and rx1 < w) or (y1 > 1 - self.edge and ry1 < h):
+            return "left_roi"
+        return None
+
+    @staticmethod
+    def _to_frame(results, roi, w, h):
+        rx0, ry0, rx1, ry1 = roi
+        cw, ch = rx1 - rx0, ry1 - ry0
+        for hand in results.multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = (lm.x * cw + rx0) / w
+                lm.y = (lm.y * ch + ry0) / h
+                lm.z = lm.z * cw / w
+
+    def process(self, rgb):
+        self.frames += 1
+        h, w = rgb.shape[:2]
+        results = None
+        if self.enabled and self.roi is not None and self.since_full < self.refresh_every:
+            rx0, ry0, rx1, ry1 = self.roi
+            self.roi_frames += 1
+            crop = np.ascontiguousarray(rgb[ry0:ry1, rx0:rx1])
+            results = self.roi_hands.process(crop)
+            reason = self._lost(results, self.roi, w, h)
+            if reason is None:
+                self._to_frame(results, self.roi, w, h)
+                self.since_full += 1
+            else:
+                self._fallback(reason)
+                results = None
+
+        if results is None:
+            results = self.hands.process(rgb)
+            self.since_full = 0
+
+        self.hand_count = len(results.multi_hand_landmarks or [])
+        self.roi = self._next_roi(results, w, h) if self.enabled else None
+        return results
+
+
+class FlowHandTracker:
+    def __init__(self, detector, every=3, min_tracked=0.85, max_error=12.0,
+                 win_size=(21, 21), max_level=3):
+        self.detector = detector      # anything with process(rgb): Hands or RoiHandTracker
+        self.every = max(1, every)    # full inference at least every N frames
+        self.min_tracked = min_tracked  # share of landmarks LK must keep, else re-infer
+        self.max_error = max_error    # mean LK error above this means the patch changed too much
+        self.lk_params = dict(winSize=win_size, maxLevel=max_level,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.results = None
+        self.points = None
+        self.prev_gray = None
+        self.since_infer = 0
+
+        self.frames = 0
+        self.inferred = 0
+        self.propagated = 0
+        self.degraded = 0
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "inferred": self.inferred,
+            "propagated": self.propagated,
+            "degraded": self.degraded,
+        }
+
+    def _infer(self, rgb, gray):
+        self.inferred += 1
+        self.since_infer = 0
+        self.results = self.detector.process(rgb)
+        self.prev_gray = gray
+        h, w = gray.shape
+        if self.results.multi_hand_landmarks:
+            self.points = np.array([[lm.x * w, lm.y * h]
+                                    for hand in self.results.multi_hand_landmarks
+                                    for lm in hand.landmark], dtype=np.float32).reshape(-1, 1, 2)
+        else:
+            self.points = None
+        return self.results
+
+    def _propagate(self, gray):
+        points, status, error = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None,
+                                                         **self.lk_params)
+        ok = status.ravel() == 1
+        if ok.mean() < self.min_tracked or float(error[ok].mean()) > self.max_error:
+            return False
+        # Landmarks LK lost keep their last position rather than jumping
+        points[~ok] = self.points[~ok]
+        h, w = gray.shape
+        flat = points.reshape(-1, 2)
+        i = 0
+        for hand in self.results.multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = float(flat[i, 0]) / w
+                lm.y = float(flat[i, 1]) / h
+                i += 1
+        self.points = points
+        self.prev_gray = gray
+        return True
+
+    def process(self, rgb):
+        self.frames += 1
+        if self.every == 1:
+            self.inferred += 1
+            return self.detector.process(rgb)
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        self.since_infer += 1
+        if self.points is None or self.since_infer >= self.every:
+            return self._infer(rgb, gray)
+        if not self._propagate(gray):
+            self.degraded += 1
+            return self._infer(rgb, gray)
+        self.propagated += 1
+        return self.results
@@ -0,0 +1,218 @@
+import math
+import cv2
+import numpy as np
+
+# HUD drawing helpers for B_Vcontrol.
+
+
+class WaveFill:
+    # A level bar filled up to `percent` with a moving sine wave on top. The wave
+    # for each animation step is precomputed (one table row per phase step).
+    # Below the wave's lowest point the bar is copied from a preallocated solid
+    # buffer; only the few rows the wave crosses go through a mask, computed
+    # with one NumPy comparison into a reused buffer. Phases are quantised to `steps` per cycle
+    # (~0.2 rad per step by default, the old per-frame increment).
+    def __init__(self, width, height, color, phase_step=0.2, waves=3, amplitude=5):
+        self.width, self.height = width, height
+        self.color = np.array(color, np.uint8)
+        # Channels of a zero colour component are left untouched, like the old mask
+        self.channels = np.flatnonzero(self.color)
+        self.bar = np.empty((height, width, 3), np.uint8)
+        self.bar[:] = self.color
+        self.steps = max(1, round(2 * math.pi / phase_step))
+        columns = np.arange(width) / width * 2 * math.pi * waves
+        phases = np.arange(self.steps)[:, None] * (2 * math.pi / self.steps)
+        self.table = np.sin(columns[None, :] + phases) * amplitude
+        self.rows = np.arange(height)[:, None]
+        self.wave_y = np.empty(width)
+        self.band = np.empty((2 * amplitude + 2, width), bool)
+
+    def phase(self, step):
+        return (step % self.steps) * 2 * math.pi / self.steps
+
+    def _fill(self, target, rows, where=None):
+        # Copying from a same-shaped buffer is far cheaper than broadcasting a colour
+        if len(self.channels) == 3:
+            np.copyto(target, self.bar[rows], where=True if where is None else where[:, :, None])
+            return
+        for c in self.channels:
+            np.copyto(target[:, :, c], self.bar[rows, :, c], where=True if where is None else where)
+
+    def draw(self, img, x, y, percent, step):
+        fill_height = int((percent / 100) * self.height)
+        np.add(self.table[step % self.steps], self.height - fill_height, out=self.wave_y)
+        np.trunc(self.wave_y, out=self.wave_y)
+        # Rows >= wave_y[column] are filled: solid below the wave's lowest point,
+        # masked between its crest and trough
+        top = min(max(int(self.wave_y.min()), 0), self.height)
+        solid = min(max(int(self.wave_y.max()), 0), self.height)
+        roi = img[y:y + self.height, x:x + self.width]
+        if solid < self.height:
+            self._fill(roi[solid:], slice(solid, None))
+        if top < solid:
+            band = self.band[:solid - top]
+            np.greater_equal(self.rows[top:solid], self.wave_y, out=band)
+            self._fill(roi[top:solid], slice(top, solid), band)
+        return img
+
+
+def _subtract(r, o):
+    # Parts of box r outside box o, as up to four boxes
+    if r[0] >= o[2] or o[0] >= r[2] or r[1] >= o[3] or o[1] >= r[3]:
+        return [r]
+    pieces = []
+    if r[1] < o[1]:
+        pieces.append((r[0], r[1], r[2], o[1]))
+    if o[3] < r[3]:
+        pieces.append((r[0], o[3], r[2], r[3]))
+    y0, y1 = max(r[1], o[1]), min(r[3], o[3])
+    if r[0] < o[0]:
+        pieces.append((r[0], y0, o[0], y1))
+    if o[2] < r[2]:
+        pieces.append((o[2], y0, r[2], y1))
+    return pieces
+
+
+def _disjoint(rects):
+    out = []
+    for r in rects:
+        pieces = [r]
+        for o in out:
+            pieces = [p for piece in pieces for p in _subtract(piece, o)]
+        out += pieces
+    return out
+
+
+FULL_FRAME_BELOW = 1280 * 720  # smaller frames are blended whole, which is faster there
+
+
+class HudCompositor:
+    # Draws the HUD on an overlay and blends it into the camera frame in place,
+    # only inside the boxes something was drawn in this frame, instead of two
+    # full-frame copies and a full-frame addWeighted. The overlay is filled from
+    # the frame lazily, box by box, the first time a box is drawn into. Static
+    # parts (zone lines, labels, instructions) are drawn once by build_static()
+    # and laid over the overlay every frame from a cache. The result matches
+    # drawing everything on a copy of the frame and blending the whole frame.
+    # Below `full_frame_below` pixels that is what it does (one copy, one
+    # addWeighted, static parts still from the cache): at 480p the box
+    # bookkeeping costs as much as the full-frame blend it saves
+    # (`python benchmarks.py hud`).
+    #
+    #   hud = HudCompositor(frame.shape, alpha=0.85)
+    #   hud.build_static(lambda hud: hud.text("VOLUME", (x, y), FONT, 0.6, color, 2))
+    #   hud.begin(frame)                          # per frame
+    #   hud.circle((x, y), 10, color, -1)
+    #   hud.composite()
+    def __init__(self, shape, alpha=0.85, full_frame_below=FULL_FRAME_BELOW):
+        h, w = shape[:2]
+        self.shape = shape
+        self.alpha = alpha
+        self.full_frame = h * w < full_frame_below
+        self.frame = None
+        self.overlay = np.zeros((h, w, 3), np.uint8)
+        self.pending = np.zeros((h, w), bool)  # overlay holds this frame's pixels here
+        # Static layer, per disjoint box: its colour as rendered on black and how
+        # much background survives (0-255) per channel, so anti-aliased text edges
+        # blend like the original
+        self.static_layers = []
+        self.static_rects = []
+        self.rects = []
+        self.static_target = None
+        self.frames = 0
+        self.blended = 0
+
+    def begin(self, frame):
+        # Drop whatever an abandoned frame (drawn into, never composited) left behind
+        for x0, y0, x1, y1 in self.rects:
+            self.pending[y0:y1, x0:x1] = False
+        self.rects.clear()
+        self.frame = frame
+        if self.full_frame:
+            np.copyto(self.overlay, frame)
+
+    @staticmethod
+    def _copy(dst, src, where):
+        # NumPy's masked copy is slow on tall, narrow boxes; cv2.copyTo is not
+        if where.all():
+            dst[:] = src
+        elif where.any():
+            dst[:] = cv2.copyTo(src, where.view(np.uint8), dst)
+
+    def mark(self, x0, y0, x1, y1):
+        # Record a dirty box (clipped to the frame) and return the image to draw on
+        h, w = self.overlay.shape[:2]
+        x0, y0, x1, y1 = max(int(x0), 0), max(int(y0), 0), min(int(x1), w), min(int(y1), h)
+        if self.static_target is not None:
+            if x0 < x1 and y0 < y1:
+                self.static_rects.append((x0, y0, x1, y1))
+            return self.static_target
+        if self.full_frame:
+            return self.overlay
+        if x0 < x1 and y0 < y1:
+            pending = self.pending[y0:y1, x0:x1]
+            self._copy(self.overlay[y0:y1, x0:x1], self.frame[y0:y1, x0:x1], ~pending)
+            pending[:] = True
+            self.rects.append((x0, y0, x1, y1))
+        return self.overlay
+
+    def circle(self, center, radius, color, thickness=1):
+        pad = radius + max(thickness, 1) + 1
+        cv2.circle(self.mark(center[0] - pad, center[1] - pad, center[0] + pad + 1, center[1] + pad + 1),
+                   center, radius, color, thickness)
+
+    def line(self, p1, p2, color, thickness=1):
+        pad = thickness + 1
+        cv2.line(self.mark(min(p1[0], p2[0]) - pad, min(p1[1], p2[1]) - pad,
+                           max(p1[0], p2[0]) + pad + 1, max(p1[1], p2[1]) + pad + 1),
+                 p1, p2, color, thickness)
+
+    def text(self, text, org, font, scale, color, thickness=1):
+        (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
+        pad = thickness + 2
+        cv2.putText(self.mark(org[0] - pad, org[1] - th - pad, org[0] + tw + pad, org[1] + baseline + pad),
+                    text, org, font, scale, color, thickness)
+
+    def build_static(self, draw):
+        # Render on black and on white: the difference is the background's share
+        on_black = np.zeros_like(self.overlay)
+        on_white = np.full_like(self.overlay, 255)
+        for target in (on_black, on_white):
+            self.static_rects.clear()
+            self.static_target = target
+            try:
+                draw(self)
+            finally:
+                self.static_target = None
+        keep = on_white - on_black
+        # Disjoint boxes, so no pixel gets the static layer laid twice
+        self.static_rects[:] = _disjoint(self.static_rects)
+        self.static_layers = [(rect, on_black[rect[1]:rect[3], rect[0]:rect[2]].copy(),
+                               keep[rect[1]:rect[3], rect[0]:rect[2]].copy())
+                              for rect in self.static_rects]
+
+    def composite(self):
+        frame = self.frame
+        # Static parts go on top, as they were drawn last
+        for (x0, y0, x1, y1), base, keep in self.static_layers:
+            overlay = self.mark(x0, y0, x1, y1)[y0:y1, x0:x1]
+            overlay[:] = cv2.add(base, cv2.multiply(overlay, keep, scale=1 / 255))
+        if self.full_frame:
+            cv2.addWeighted(self.overlay, self.alpha, frame, 1 - self.alpha, 0, frame)
+            self.blended += frame.shape[0] * frame.shape[1]
+        for x0, y0, x1, y1 in self.rects:
+            pending = self.pending[y0:y1, x0:x1]
+            target = frame[y0:y1, x0:x1]
+            blended = cv2.addWeighted(self.overlay[y0:y1, x0:x1], self.alpha, target, 1 - self.alpha, 0)
+            # Overlapping boxes: each pixel is blended once, by the first box holding it
+            self._copy(target, blended, pending)
+            pending[:] = False
+            self.blended += (x1 - x0) * (y1 - y0)
+        self.rects.clear()
+        self.frames += 1
+        return frame
+
+    def stats(self):
+        area = self.overlay.shape[0] * self.overlay.shape[1]
+        return {"frames": self.frames,
+                "blended_fraction": round(self.blended / max(self.frames, 1) / area, 3)}
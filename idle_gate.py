@@ -0,0 +1,58 @@
+import time
+import cv2
+import numpy as np
+
+# Cheap idle tier for the vision loops. Instead of exiting when nobody is in
+# front of the camera, a module parks here: frames are sampled at a low rate,
+# shrunk to a thumbnail and differenced, and full MediaPipe inference resumes
+# only once something moves.
+
+IDLE_FPS = 5
+IDLE_TEXT = "Idle - move to wake"
+
+
+class MotionGate:
+    def __init__(self, size=(64, 48), threshold=18, min_changed=0.02, fps=IDLE_FPS):
+        self.size = size                # thumbnail the difference is computed on
+        self.threshold = threshold      # per-pixel grey level change that counts
+        self.min_changed = min_changed  # share of changed pixels that counts as motion
+        self.interval = 1.0 / fps
+        self.prev = None
+        self.small = np.empty(size[::-1], np.uint8)
+        self.diff = np.empty(size[::-1], np.uint8)
+
+    def reset(self):
+        self.prev = None
+
+    def motion(self, frame):
+        # Channel order doesn't matter for a difference, so BGR and RGB both work
+        cv2.cvtColor(cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY, dst=self.small)
+        if self.prev is None:
+            self.prev = self.small.copy()
+            return False
+        cv2.absdiff(self.small, self.prev, dst=self.diff)
+        self.prev, self.small = self.small, self.prev
+        return np.count_nonzero(self.diff > self.threshold) > self.min_changed * self.diff.size
+
+    def wait_for_motion(self, cap, max_idle=None, preview=None):
+        # Returns "motion", "timeout" (after max_idle seconds), "quit" or "ended";
+        # preview is the module's preview.Preview (window, quit signals)
+        self.reset()
+        start = time.time()
+        while True:
+            tick = time.time()
+            ret, frame = cap.read()
+            if not ret:
+                return "ended"
+            if self.motion(frame):
+                return "motion"
+            if max_idle is not None and tick - start > max_idle:
+                return "timeout"
+            if preview is not None:
+                if preview.visible():
+                    cv2.putText(frame, IDLE_TEXT, (10, frame.shape[0] - 15), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 255), 2)
+                if not preview.show(frame):
+                    return "quit"
+            delay = self.interval - (time.time() - tick)
+            if delay > 0:
+                time.sleep(delay)
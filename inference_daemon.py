@@ -0,0 +1,275 @@
+import os
+import signal
+import threading
+import time
+import numpy as np
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from shm_ring import ShmRing
+
+# Long-lived MediaPipe process. mainUI starts it once; it imports mediapipe and
+# keeps Hands / FaceMesh graphs warm so a freshly launched module only has to
+# connect, instead of importing mediapipe and building graphs itself.
+#
+# Modules ask for a graph with hands_graph(...) / face_mesh_graph(...). When the
+# daemon is reachable they get a RemoteGraph that writes each frame into a
+# private shared-memory slot and receives landmark arrays back; otherwise they
+# get a local MediaPipe graph exactly like before.
+#
+#   python inference_daemon.py
+
+DAEMON_ADDRESS = ("127.0.0.1", int(os.environ.get("NEURO_INFERENCE_PORT", "47321")))
+# multiprocessing.connection unpickles what it receives, so the key is all that
+# keeps other local processes from running code in the daemon: a random one
+# per session, which mainUI generates and hands to the daemon and modules
+_KEY = os.environ.get("NEURO_INFERENCE_KEY")
+AUTHKEY = bytes.fromhex(_KEY) if _KEY else None
+DAEMON_WAIT = 10.0 if os.environ.get("NEURO_INFERENCE_DAEMON") else 0.0  # set by mainUI when it runs the daemon
+
+# Graphs built at startup so module launches never wait (see model_modes.py);
+# mouse control holds two cursor graphs at once (full frame + ROI crops)
+WARM_MODES = ["cursor", "cursor", "cursor.switcher", "cursor.switcher", "levels", "keyboard", "blink"]
+
+
+# ─── Light-weight results (same shape as MediaPipe's) ─────────────────
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+    def HasField(self, name):  # mp_drawing checks visibility/presence
+        return False
+
+
+class LandmarkList:
+    __slots__ = ("landmark",)
+
+    def __init__(self, points):
+        self.landmark = [Landmark(x, y, z) for x, y, z in points.tolist()]
+
+
+class Classification:
+    __slots__ = ("score", "label", "index")
+
+    def __init__(self, score, label, index):
+        self.score, self.label, self.index = score, label, index
+
+
+class ClassificationList:
+    __slots__ = ("classification",)
+
+    def __init__(self, score, label, index):
+        self.classification = [Classification(score, label, index)]
+
+
+class Results:
+    def __init__(self, kind, points, scores, labels):
+        lists = [LandmarkList(p) for p in points] or None
+        self.multi_hand_landmarks = self.multi_face_landmarks = None
+        self.multi_handedness = None
+        if kind == "hands":
+            self.multi_hand_landmarks = lists
+            if lists:
+                self.multi_handedness = [ClassificationList(float(s), l, i)
+                                         for i, (s, l) in enumerate(zip(scores, labels))]
+        else:
+            self.multi_face_landmarks = lists
+
+
+def _pack(kind, results):
+    lists = results.multi_hand_landmarks if kind == "hands" else results.multi_face_landmarks
+    if not lists:
+        return np.zeros((0, 0, 3), np.float32), [], []
+    points = np.array([[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in lists], np.float32)
+    scores, labels = [], []
+    if kind == "hands":
+        for handedness in results.multi_handedness:
+            scores.append(handedness.classification[0].score)
+            labels.append(handedness.classification[0].label)
+    return points, scores, labels
+
+
+# ─── Server ────────────────────────────────────────────────────────────
+def _config_key(kind, config):
+    return kind, tuple(sorted(config.items()))
+
+
+class GraphPool:
+    # Each client session borrows its own graph (MediaPipe keeps tracking state
+    # per graph) and hands it back warm when it disconnects.
+    def __init__(self):
+        import mediapipe as mp
+        self.mp = mp
+        self.idle = {}
+        self.lock = threading.Lock()
+
+    def build(self, kind, config):
+        if kind == "hands":
+            return self.mp.solutions.hands.Hands(**config)
+        if kind == "face_mesh":
+            return self.mp.solutions.face_mesh.FaceMesh(**config)
+        raise ValueError(f"unknown graph kind: {kind}")
+
+    def warm(self, modes):
+        from model_modes import model_mode
+        for name in modes:
+            config = model_mode(name)
+            kind = config.pop("kind")
+            self.release(kind, config, self.build(kind, config))
+
+    def borrow(self, kind, config):
+        with self.lock:
+            graphs = self.idle.get(_config_key(kind, config))
+            if graphs:
+                return graphs.pop()
+        return self.build(kind, config)
+
+    def release(self, kind, config, graph):
+        with self.lock:
+            self.idle.setdefault(_config_key(kind, config), []).append(graph)
+
+
+def _serve_client(conn, pool):
+    graph = ring = None
+    kind = config = None
+    try:
+        while True:
+            msg = conn.recv()
+            op = msg[0]
+            if op == "open":
+                _, kind, config = msg
+                graph = pool.borrow(kind, config)
+                conn.send(("ok",))
+            elif op == "ring":
+                if ring is not None:
+                    ring.close()
+                ring = ShmRing.attach(msg[1])
+                conn.send(("ok",))
+            elif op == "process":
+                _, h, w = msg
+                _, _, slot = ring.latest()
+                results = graph.process(np.ascontiguousarray(slot[:h, :w]))
+                conn.send(("result",) + _pack(kind, results))
+            elif op == "close":
+                break
+    except (EOFError, ConnectionResetError, BrokenPipeError):
+        pass
+    finally:
+        if ring is not None:
+            ring.close()
+        if graph is not None:
+            pool.release(kind, config, graph)
+        conn.close()
+
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+
+def run_daemon(address=DAEMON_ADDRESS, authkey=AUTHKEY):
+    if authkey is None:
+        authkey = os.urandom(32)
+        print(f"🔑 No NEURO_INFERENCE_KEY set; clients need NEURO_INFERENCE_KEY={authkey.hex()}")
+    start = time.time()
+    pool = GraphPool()
+    pool.warm(WARM_MODES)
+    listener = Listener(address, authkey=authkey)
+    print(f"🧠 Inference daemon ready on {address[0]}:{address[1]} ({time.time() - start:.1f}s warm-up)")
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, AuthenticationError):
+                continue  # failed handshake from a stray client
+            threading.Thread(target=_serve_client, args=(conn, pool), daemon=True).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        print("📴 Inference daemon stopped")
+
+
+# ─── Client ────────────────────────────────────────────────────────────
+class RemoteGraph:
+    _rings = 0
+
+    def __init__(self, conn, kind, config):
+        self.conn = conn
+        self.kind = kind
+        self.ring = None
+        self.conn.send(("open", kind, config))
+        self.conn.recv()
+
+    def _ensure_ring(self, h, w, c):
+        if self.ring is not None:
+            rh, rw, rc = self.ring.slot_shape
+            if h <= rh and w <= rw and c == rc:
+                return
+            self.ring.close()
+        RemoteGraph._rings += 1
+        name = f"neuro_infer_{os.getpid()}_{RemoteGraph._rings}"
+        self.ring = ShmRing.create(name, (h, w, c), np.uint8, slots=1)
+        self.conn.send(("ring", name))
+        self.conn.recv()
+
+    def process(self, rgb):
+        h, w, c = rgb.shape
+        self._ensure_ring(h, w, c)
+        self.ring.claim()[:h, :w] = rgb
+        self.ring.commit()
+        self.conn.send(("process", h, w))
+        _, points, scores, labels = self.conn.recv()
+        return Results(self.kind, points, scores, labels)
+
+    def close(self):
+        try:
+            self.conn.send(("close",))
+        except OSError:
+            pass
+        self.conn.close()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _connect(wait):
+    if AUTHKEY is None:
+        return None  # no session key: this process can't talk to a daemon
+    deadline = time.time() + wait
+    while True:
+        try:
+            return Client(DAEMON_ADDRESS, authkey=AUTHKEY)
+        except OSError:
+            if time.time() >= deadline:
+                return None
+            time.sleep(0.2)
+
+
+def _graph(kind, config, wait):
+    conn = _connect(wait)
+    if conn is not None:
+        return RemoteGraph(conn, kind, config)
+    import mediapipe as mp  # no daemon: pay the import and graph build here
+    if kind == "hands":
+        return mp.solutions.hands.Hands(**config)
+    return mp.solutions.face_mesh.FaceMesh(**config)
+
+
+def hands_graph(wait=DAEMON_WAIT, **config):
+    return _graph("hands", config, wait)
+
+
+def face_mesh_graph(wait=DAEMON_WAIT, **config):
+    return _graph("face_mesh", config, wait)
+
+
+if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, _stop)
+    run_daemon()
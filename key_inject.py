@@ -0,0 +1,176 @@
+import os
+import sys
+import time
+from collections import namedtuple
+
+# Keyboard injection for the touchless keyboard (code1.py) and face unlock.
+# Callers build a list of key events and hand the whole list to send(); the
+# Windows backend turns it into one SendInput call instead of one per key.
+#
+#   injector = make_injector()
+#   injector.send(text_events("hunter2") + tap("enter"))
+#   injector.send(chord("ctrl", "c"))
+#
+#   sendinput  Windows user32.SendInput, one batched array
+#   pyautogui  anywhere pyautogui works, with its per-call pause switched off
+#   fake       records events, for measuring on headless boxes
+#
+# NEURO_KEY_BACKEND picks one (default: by platform). NEURO_KEY_DELAY (seconds)
+# spaces events out for apps that drop fast input; 0 sends the batch at once.
+
+KEY_BACKEND = os.environ.get("NEURO_KEY_BACKEND", "sendinput" if sys.platform == "win32" else "pyautogui")
+KEY_DELAY = float(os.environ.get("NEURO_KEY_DELAY", "0"))
+
+KeyEvent = namedtuple("KeyEvent", "key down")
+
+# Named keys (pyautogui names) and their Windows virtual-key codes
+KEY_CODES = {
+    "enter": 0x0D, "tab": 0x09, "space": 0x20, "backspace": 0x08, "delete": 0x2E,
+    "esc": 0x1B, "capslock": 0x14, "printscreen": 0x2C,
+    "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28,
+    "shift": 0x10, "ctrl": 0x11, "alt": 0x12, "win": 0x5B,
+    **{f"f{i}": 0x6F + i for i in range(1, 13)},
+}
+MODIFIERS = {"shift", "ctrl", "alt", "win"}
+
+
+def tap(key):
+    return [KeyEvent(key, True), KeyEvent(key, False)]
+
+
+def chord(*keys):
+    # Press in order, release in reverse: chord("ctrl", "shift", "t")
+    return [KeyEvent(k, True) for k in keys] + [KeyEvent(k, False) for k in reversed(keys)]
+
+
+def text_events(text):
+    events = []
+    for ch in text:
+        events += tap(ch)
+    return events
+
+
+class RecordingBackend:
+    def __init__(self, delay=KEY_DELAY):
+        self.delay = delay
+        self.events = []
+        self.batches = 0
+
+    def send(self, events):
+        self.batches += 1
+        for event in events:
+            self.events.append(event)
+            if self.delay:
+                time.sleep(self.delay)
+
+    def text(self):
+        # What a text field would show: character key-downs, backspace applied
+        typed = []
+        for key, down in self.events:
+            if not down:
+                continue
+            if key == "backspace" and typed:
+                typed.pop()
+            elif key == "space":
+                typed.append(" ")
+            elif key == "enter":
+                typed.append("\n")
+            elif len(key) == 1:
+                typed.append(key)
+        return "".join(typed)
+
+
+class PyAutoGuiBackend:
+    def __init__(self, delay=KEY_DELAY):
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.delay = delay
+
+    def send(self, events):
+        # Runs of plain character taps go out as one write(); the rest key by key
+        run = []
+        for i, (key, down) in enumerate(events):
+            if len(key) == 1:
+                if down:
+                    run.append(key)
+                continue
+            if run:
+                self.pyautogui.write("".join(run), interval=self.delay, _pause=False)
+                run = []
+            if down:
+                self.pyautogui.keyDown(key, _pause=False)
+            else:
+                self.pyautogui.keyUp(key, _pause=False)
+            if self.delay:
+                time.sleep(self.delay)
+        if run:
+            self.pyautogui.write("".join(run), interval=self.delay, _pause=False)
+
+
+class SendInputBackend:
+    def __init__(self, delay=KEY_DELAY):
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        self.delay = delay
+        ULONG_PTR = ctypes.POINTER(ctypes.c_ulong)
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ULONG_PTR)]
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                        ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+        class _INPUT(ctypes.Union):
+            _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+        # The union matters: SendInput rejects the batch unless cbSize is the
+        # full sizeof(INPUT), mouse member included
+        class INPUT(ctypes.Structure):
+            _anonymous_ = ("u",)
+            _fields_ = [("type", wintypes.DWORD), ("u", _INPUT)]
+
+        self.KEYBDINPUT, self.INPUT = KEYBDINPUT, INPUT
+        self.user32 = ctypes.windll.user32
+
+    KEYEVENTF_KEYUP, KEYEVENTF_UNICODE, INPUT_KEYBOARD = 0x0002, 0x0004, 1
+
+    def _input(self, key, down, chorded):
+        flags = 0 if down else self.KEYEVENTF_KEYUP
+        if key in KEY_CODES:
+            ki = self.KEYBDINPUT(KEY_CODES[key], 0, flags, 0, None)
+        elif chorded:
+            # Shortcuts need the virtual key (Ctrl+C), not a unicode character
+            ki = self.KEYBDINPUT(self.user32.VkKeyScanW(ord(key)) & 0xFF, 0, flags, 0, None)
+        else:
+            ki = self.KEYBDINPUT(0, ord(key), flags | self.KEYEVENTF_UNICODE, 0, None)
+        return self.INPUT(type=self.INPUT_KEYBOARD, ki=ki)
+
+    def send(self, events):
+        held = set()
+        inputs = []
+        for key, down in events:
+            inputs.append(self._input(key, down, bool(held)))
+            if key in MODIFIERS:
+                (held.add if down else held.discard)(key)
+        size = self.ctypes.sizeof(self.INPUT)
+        if not self.delay:
+            batch = (self.INPUT * len(inputs))(*inputs)
+            sent = self.user32.SendInput(len(inputs), batch, size)
+            if sent != len(inputs):
+                print(f"⚠️ SendInput injected {sent}/{len(inputs)} key events")
+            return
+        for inp in inputs:
+            self.user32.SendInput(1, self.ctypes.byref(inp), size)
+            time.sleep(self.delay)
+
+
+BACKENDS = {"sendinput": SendInputBackend, "pyautogui": PyAutoGuiBackend, "fake": RecordingBackend}
+
+
+def make_injector(name=None, delay=None):
+    return BACKENDS[name or KEY_BACKEND](KEY_DELAY if delay is None else delay)
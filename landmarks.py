@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+
+# MediaPipe results converted once per frame into preallocated float32 arrays,
+# so the gesture maths runs as a handful of vectorised NumPy operations instead
+# of per-landmark attribute access and tuple building.
+#
+# Coordinates are pixels: x * w, y * h and z * w (MediaPipe's z shares x's scale).
+
+HAND_POINTS = 21
+FACE_POINTS = 468
+
+# Hand landmark indices (mp.solutions.hands.HandLandmark)
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_TIP = 16
+PINKY_TIP = 20
+
+# Same topology as mp.solutions.hands.HAND_CONNECTIONS, without importing mediapipe
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12), (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+])
+
+# Face-mesh eye contours in EAR order: corner, top, top, corner, bottom, bottom
+LEFT_EYE = [33, 160, 158, 133, 153, 144]
+RIGHT_EYE = [362, 385, 387, 263, 373, 380]
+EYES = np.array([LEFT_EYE, RIGHT_EYE])
+# EAR endpoint pairs per eye: (p1, p5), (p2, p4), (p0, p3)
+_EAR_FROM = EYES[:, [1, 2, 0]]
+_EAR_TO = EYES[:, [5, 4, 3]]
+
+
+class HandArrays:
+    def __init__(self, max_hands=2):
+        self.buf = np.zeros((max_hands, HAND_POINTS, 3), np.float32)
+        self.scale = np.ones(3, np.float32)
+        self.count = 0
+
+    def fill(self, results, w=1, h=1):
+        # Returns a (hands, 21, 3) view; valid until the next fill()
+        hands = results.multi_hand_landmarks or []
+        self.count = min(len(hands), len(self.buf))
+        for i in range(self.count):
+            self.buf[i] = [(lm.x, lm.y, lm.z) for lm in hands[i].landmark]
+        self.scale[:] = (w, h, w)
+        view = self.buf[:self.count]
+        view *= self.scale
+        return view
+
+
+class FaceArrays:
+    def __init__(self, points=FACE_POINTS):
+        self.buf = np.zeros((points, 3), np.float32)
+        self.scale = np.ones(3, np.float32)
+
+    def fill(self, face_landmarks, w=1, h=1):
+        # Returns the (468, 3) buffer; valid until the next fill()
+        landmarks = face_landmarks.landmark
+        n = min(len(landmarks), len(self.buf))
+        self.buf[:n] = [(lm.x, lm.y, lm.z) for lm in landmarks[:n]]
+        self.scale[:] = (w, h, w)
+        self.buf *= self.scale
+        return self.buf
+
+
+def distances(a, b):
+    # Euclidean distance over the last axis using x, y only
+    d = a[..., :2] - b[..., :2]
+    return np.sqrt((d * d).sum(axis=-1))
+
+
+def pinch_distances(hands, tip_a=THUMB_TIP, tip_b=INDEX_TIP):
+    # (hands,) distance between two fingertips of every hand
+    return distances(hands[:, tip_a], hands[:, tip_b])
+
+
+def eye_aspect_ratio(face, eyes=None):
+    # (eyes,) EAR for every eye in one shot: (|p1-p5| + |p2-p4|) / (2 |p0-p3|)
+    if eyes is None:
+        d = distances(face[_EAR_FROM], face[_EAR_TO])
+    else:
+        eyes = np.asarray(eyes)
+        d = distances(face[eyes[:, [1, 2, 0]]], face[eyes[:, [5, 4, 3]]])
+    return (d[:, 0] + d[:, 1]) / (2.0 * d[:, 2])
+
+
+def draw_hands(frame, hands, line_color=(224, 224, 224), point_color=(0, 0, 255)):
+    # mp_drawing-style skeleton straight from the pixel arrays
+    for hand in hands:
+        xy = hand[:, :2].astype(np.int32)
+        cv2.polylines(frame, list(xy[HAND_CONNECTIONS]), False, line_color, 2)
+        for x, y in xy.tolist():
+            cv2.circle(frame, (x, y), 3, point_color, -1)
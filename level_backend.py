@@ -0,0 +1,199 @@
+import glob
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# System volume / screen brightness for B_Vcontrol, as percentages 0-100.
+#
+#   windows  pycaw (volume) + WMI (brightness), what B_Vcontrol always used
+#   linux    sysfs backlight + ALSA `amixer`
+#   fake     in memory, records every call; for headless runs and replays
+#
+# NEURO_LEVEL_BACKEND picks one (default: by platform). LevelWorker sits in front
+# of a backend: it ignores changes below a threshold, needs a larger move to
+# reverse direction (hysteresis against pinch jitter) and applies only the
+# latest value per channel, at most `rate` times a second, on its own thread.
+
+LEVEL_BACKEND = os.environ.get("NEURO_LEVEL_BACKEND", "windows" if sys.platform == "win32" else "linux")
+CHANNELS = ("volume", "brightness")
+
+
+class WindowsLevels:
+    def __init__(self):
+        from ctypes import cast, POINTER
+        import comtypes
+        import wmi
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
+        self.volume = cast(interface, POINTER(IAudioEndpointVolume))
+        self.wmi_service = wmi.WMI(namespace='wmi')
+        self.brightness_ctrl = self.wmi_service.WmiMonitorBrightnessMethods()[0]
+
+    def get(self, channel):
+        if channel == "volume":
+            return round(self.volume.GetMasterVolumeLevelScalar() * 100)
+        return int(self.wmi_service.WmiMonitorBrightness()[0].CurrentBrightness)
+
+    def set(self, channel, percent):
+        if channel == "volume":
+            self.volume.SetMasterVolumeLevelScalar(percent / 100, None)
+        else:
+            self.brightness_ctrl.WmiSetBrightness(percent, 0)
+
+
+class LinuxLevels:
+    def __init__(self, mixer="Master", backlight=None):
+        self.mixer = mixer
+        if backlight is None:
+            found = sorted(glob.glob("/sys/class/backlight/*"))
+            backlight = found[0] if found else None
+        self.backlight = backlight
+        self.max_brightness = int(self._read("max_brightness")) if backlight else 0
+
+    def _read(self, name):
+        with open(os.path.join(self.backlight, name)) as f:
+            return f.read().strip()
+
+    def get(self, channel):
+        if channel == "volume":
+            out = subprocess.run(["amixer", "-M", "get", self.mixer], capture_output=True, text=True).stdout
+            match = re.search(r"\[(\d+)%\]", out)
+            return int(match.group(1)) if match else 0
+        if not self.max_brightness:
+            return 0
+        return round(int(self._read("brightness")) * 100 / self.max_brightness)
+
+    def set(self, channel, percent):
+        if channel == "volume":
+            subprocess.run(["amixer", "-q", "-M", "set", self.mixer, f"{percent}%"], check=False)
+        elif self.max_brightness:
+            # Needs write access to the backlight (udev rule or the video group)
+            with open(os.path.join(self.backlight, "brightness"), "w") as f:
+                f.write(str(round(percent * self.max_brightness / 100)))
+
+
+class FakeLevels:
+    def __init__(self, volume=50, brightness=50):
+        self.levels = {"volume": volume, "brightness": brightness}
+        self.calls = []  # (channel, percent) in the order they were applied
+
+    def get(self, channel):
+        return self.levels[channel]
+
+    def set(self, channel, percent):
+        self.levels[channel] = percent
+        self.calls.append((channel, percent))
+
+
+BACKENDS = {"windows": WindowsLevels, "linux": LinuxLevels, "fake": FakeLevels}
+
+
+def make_backend(name=None):
+    return BACKENDS[name or LEVEL_BACKEND]()
+
+
+class LevelWorker:
+    # `make` builds the backend (e.g. make_backend). It is called on the worker
+    # thread, not here: pycaw's COM pointers and the WMI connection belong to
+    # the thread that created them, and that thread must have called
+    # CoInitialize, which only the main thread gets for free.
+    def __init__(self, make=make_backend, rate=10.0, threshold=2, hysteresis=5):
+        self.make = make
+        self.backend = None
+        self.period = 1.0 / rate
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.values = dict.fromkeys(CHANNELS, 0)
+        self.direction = dict.fromkeys(CHANNELS, 0)
+        self.pending = {}
+        self.applied_at = dict.fromkeys(CHANNELS, 0.0)
+        self.requests = self.accepted = self.applied = 0
+        self.cond = threading.Condition()
+        self.running = True
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout=5.0)  # so value() starts from the real levels
+
+    def _setup(self):
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass
+        try:
+            self.backend = self.make()
+        except Exception as e:
+            print(f"⚠️ Level backend unavailable: {e}")
+            return
+        # Start from the real levels, not 0
+        for channel in CHANNELS:
+            try:
+                self.values[channel] = int(self.backend.get(channel))
+            except Exception as e:
+                print(f"⚠️ Could not read {channel}: {e}")
+
+    def value(self, channel):
+        return self.values[channel]
+
+    def request(self, channel, percent):
+        # Returns the level to show: the new one if accepted, else the current one
+        percent = int(min(max(percent, 0), 100))
+        with self.cond:
+            self.requests += 1
+            current = self.values[channel]
+            change = percent - current
+            direction = (change > 0) - (change < 0)
+            needed = self.threshold if direction == self.direction[channel] else self.hysteresis
+            # The ends of the range always go through so 0% and 100% are reachable
+            if change == 0 or (abs(change) < needed and percent not in (0, 100)):
+                return current
+            self.values[channel] = percent
+            self.direction[channel] = direction
+            self.pending[channel] = percent
+            self.accepted += 1
+            self.cond.notify()
+        return percent
+
+    def _run(self):
+        try:
+            self._setup()
+        finally:
+            self.ready.set()
+        while True:
+            with self.cond:
+                while self.running and not self.pending:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                now = time.perf_counter()
+                # Oldest-applied channel first; wait out its rate limit without the lock
+                channel = min(self.pending, key=self.applied_at.get)
+                delay = self.applied_at[channel] + self.period - now
+                if delay > 0 and self.running:
+                    self.cond.wait(delay)
+                    continue
+                percent = self.pending.pop(channel)
+            if self.backend is None:
+                continue
+            try:
+                self.backend.set(channel, percent)
+                self.applied += 1
+            except Exception as e:
+                print(f"⚠️ Could not set {channel}: {e}")
+            self.applied_at[channel] = time.perf_counter()
+
+    def stats(self):
+        return {"requests": self.requests, "accepted": self.accepted, "applied": self.applied,
+                "pending": len(self.pending)}
+
+    def close(self):
+        # Pending values are still applied before the thread exits
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join(timeout=2.0)
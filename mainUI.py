@@ -71,12 +71,17 @@ class HUDLauncher(QWidget):
         self.icon_window = HUDIcon(self)
         self.offset = None
         self.mouse_control_process = None
+        self.service_processes = {}
         self.script_processes = {}
         self.inactive_timer = QTimer()
         self.inactive_timer.setInterval(5000)
         self.inactive_timer.timeout.connect(self.auto_restart_mouse_control)
 
         self.init_ui()
+        # Per-session key for the inference daemon's socket, inherited by every child
+        os.environ.setdefault("NEURO_INFERENCE_KEY", os.urandom(32).hex())
+        self.start_service("camera_broker.py", "NEURO_CAMERA_BROKER")
+        self.start_service("inference_daemon.py", "NEURO_INFERENCE_DAEMON")
         self.start_mouse_control()
 
     def init_ui(self):
@@ -155,6 +160,27 @@ class HUDLauncher(QWidget):
         self.frame.setLayout(layout)
         self.show_animation()
 
+    def start_service(self, script, env_flag):
+        # Resident helpers (camera broker, inference daemon) live as long as the launcher
+        if script not in self.service_processes:
+            process = QProcess(self)
+            process.setProgram(sys.executable)
+            process.setArguments([script])
+            process.setProcessChannelMode(QProcess.ForwardedChannels)
+            process.start()
+            process.waitForStarted()
+            self.service_processes[script] = (process, env_flag)
+            os.environ[env_flag] = "1"  # children wait for the service instead of doing the work themselves
+
+    def stop_services(self):
+        for process, env_flag in self.service_processes.values():
+            process.terminate()
+            if not process.waitForFinished(2000):
+                process.kill()
+                process.waitForFinished()
+            os.environ.pop(env_flag, None)
+        self.service_processes.clear()
+
     def toggle_mouse_control(self):
         if self.switch_button.isChecked():
             self.start_mouse_control()
@@ -227,6 +253,7 @@ class HUDLauncher(QWidget):
                 self.minimize_to_icon()
             elif label == "❌ Exit":
                 self.stop_mouse_control()
+                self.stop_services()
                 sys.exit()
             elif script_name:
                 self.stop_mouse_control()
@@ -303,5 +330,7 @@ if __name__ == "__main__":
     os.environ["PYTHONUNBUFFERED"] = "1"
     app = QApplication(sys.argv)
     launcher = HUDLauncher()
+    # However the launcher goes away, don't leave the broker holding the camera
+    app.aboutToQuit.connect(launcher.stop_services)
     launcher.show()
     sys.exit(app.exec_())
@@ -0,0 +1,90 @@
+import os
+from inference_daemon import hands_graph, face_mesh_graph
+
+# Model descriptors per module and sub-mode: which MediaPipe graph, its
+# model_complexity (0 = lite, 1 = full), how many hands/faces to look for and the
+# confidence thresholds. Override one with NEURO_MODEL_<NAME>, dots as
+# underscores, e.g. NEURO_MODEL_CURSOR="model_complexity=1,max_num_hands=2".
+#
+# Compare the options on a recording with:  python benchmarks.py models clip.nfr
+
+MODEL_MODES = {
+    # Both cursor sub-modes need two hands: every two-hand gesture starts from the
+    # plain cursor state. The lite model is enough to steer the pointer; the full
+    # one gives steadier thumb positions while picking a window.
+    "cursor": {"kind": "hands", "model_complexity": 0, "max_num_hands": 2,
+               "min_detection_confidence": 0.7, "min_tracking_confidence": 0.7},
+    "cursor.switcher": {"kind": "hands", "model_complexity": 1, "max_num_hands": 2,
+                        "min_detection_confidence": 0.7, "min_tracking_confidence": 0.7},
+    # B_Vcontrol only reads thumb and index tips
+    "levels": {"kind": "hands", "model_complexity": 0, "max_num_hands": 2,
+               "min_detection_confidence": 0.7, "min_tracking_confidence": 0.7},
+    # The keyboard only follows the first hand
+    "keyboard": {"kind": "hands", "model_complexity": 0, "max_num_hands": 1,
+                 "min_detection_confidence": 0.5, "min_tracking_confidence": 0.5},
+    "blink": {"kind": "face_mesh", "static_image_mode": False, "max_num_faces": 1,
+              "min_detection_confidence": 0.7, "min_tracking_confidence": 0.7},
+    # Reference the benchmark measures landmark error against
+    "reference": {"kind": "hands", "model_complexity": 1, "max_num_hands": 2,
+                  "min_detection_confidence": 0.5, "min_tracking_confidence": 0.5},
+}
+
+
+def _parse_value(text):
+    text = text.strip()
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def model_mode(name):
+    mode = dict(MODEL_MODES[name])
+    override = os.environ.get("NEURO_MODEL_" + name.upper().replace(".", "_"))
+    if override:
+        for item in override.split(","):
+            key, _, value = item.partition("=")
+            mode[key.strip()] = _parse_value(value)
+    return mode
+
+
+def graph_for(name, **kwargs):
+    config = model_mode(name)
+    kind = config.pop("kind")
+    factory = hands_graph if kind == "hands" else face_mesh_graph
+    return factory(**kwargs, **config)
+
+
+class ModeGraph:
+    # One graph per sub-mode, built on first use and kept warm; process() goes to
+    # whichever mode is active so callers can switch without rebuilding anything.
+    def __init__(self, modes, active=None):
+        self.modes = list(modes)
+        self.active = active or self.modes[0]
+        self.graphs = {}
+
+    def set_mode(self, name):
+        if name not in self.modes:
+            raise KeyError(name)
+        self.active = name
+
+    def graph(self):
+        if self.active not in self.graphs:
+            self.graphs[self.active] = graph_for(self.active)
+        return self.graphs[self.active]
+
+    def process(self, rgb):
+        return self.graph().process(rgb)
+
+    def close(self):
+        for graph in self.graphs.values():
+            graph.close()
+        self.graphs.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
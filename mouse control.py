@@ -1,210 +1,199 @@
-import cv2
-import mediapipe as mp
 import pyautogui
 from pynput.mouse import Controller, Button
 import time
 import os
 import sys
-import math
-import subprocess
+from capture import open_capture
+from hand_tracking import RoiHandTracker, FlowHandTracker
+from idle_gate import MotionGate
+from landmarks import HandArrays, draw_hands
+from mouse_gestures import GestureActions, build_mouse_engine, SWITCHER_ON, SHOW_DESKTOP_COOLDOWN
+from model_modes import ModeGraph
+from cursor_filter import make_filter
+from cursor_output import CursorOutput, CURSOR_RATE
+from action_executor import ActionExecutor
+from preview import Preview
 
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
 mouse = Controller()
-cap = cv2.VideoCapture(0)
+cap = open_capture(profile="cursor", threaded=True)
+idle_gate = MotionGate()
+hand_arrays = HandArrays(max_hands=2)
 
 HAND_TIMEOUT = 10
-SWITCH_DELAY = 1
+WINDOW_NAME = f"Neuro-Mouse Control Center (Idles after {HAND_TIMEOUT} s without a hand)"
+preview = Preview(WINDOW_NAME)  # NEURO_PREVIEW: full, every=N, fps=R or headless
 last_hand_time = time.time()
-task_switcher_active = False
-direction = None
-direction_hold_start = None
-scroll_sensitivity = 5
 
-prev_mouse_x, prev_mouse_y = 0, 0
-smoothing = 3
 
-dragging = False
-index_finger_hold_start = None
-DOUBLE_CLICK_MAX_TIME = 0.4
+# ─── OS side effects (run on the executor thread, never in the vision loop) ───
+def show_desktop():
+    print("🧹 Minimizing All Windows – Show Desktop")
+    pyautogui.hotkey('win', 'd')
 
-def distance(a, b):
-    return math.hypot(a[0] - b[0], a[1] - b[1])
 
-with mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.7, min_tracking_confidence=0.7) as hands:
+def switcher_open():
+    print("🌀 Task Switcher Activated")
+    pyautogui.keyDown('alt')
+    pyautogui.press('tab')
+
+
+def switcher_left():
+    print("⬅ Switching Left")
+    pyautogui.keyDown('shift')
+    pyautogui.press('tab')
+    pyautogui.keyUp('shift')
+
+
+def switcher_right():
+    print("➡ Switching Right")
+    pyautogui.press('tab')
+
+
+def switcher_close():
+    print("✅ Task Selected, Exiting Task Switcher")
+    pyautogui.keyUp('alt')
+
+
+def scroll(amount):
+    print("⬆ Scrolling Up" if amount > 0 else "⬇ Scrolling Down")
+    mouse.scroll(0, amount)
+
+
+def double_click():
+    print("🖱️ Double Click Triggered")
+    mouse.click(Button.left, 2)
+
+
+def drag_start():
+    print("🖱️ Drag Start")
+    mouse.press(Button.left)
+
+
+def drag_end(hand_lost):
+    print("🖱️ Drag End (Hand Lost)" if hand_lost else "🖱️ Drag End")
+    mouse.release(Button.left)
+
+
+def click(button):
+    mouse.click(button, 1)
+
+
+# A pinch held over several frames clicks at most every CLICK_COOLDOWN seconds
+CLICK_COOLDOWN = 0.25
+executor = ActionExecutor(
+    cooldowns={"show_desktop": SHOW_DESKTOP_COOLDOWN, "left_click": CLICK_COOLDOWN, "right_click": CLICK_COOLDOWN},
+    coalesce={"scroll"},
+    collapse={"left_click", "right_click", "double_click"},
+)
+SCREEN_W, SCREEN_H = pyautogui.size()
+
+
+class MouseActions(GestureActions):
+    def __init__(self):
+        self.cursor_filter = make_filter()  # NEURO_CURSOR_FILTER, see cursor_filter.py
+        # Pointer moves from its own CURSOR_RATE Hz thread, between camera frames too
+        self.output = CursorOutput(self.cursor_filter, self.set_position) if CURSOR_RATE > 0 else None
+
+    def set_position(self, point):
+        mouse.position = point
+
+    def stats(self):
+        return self.output.stats() if self.output is not None else "per frame"
+
+    def show_desktop(self):
+        executor.submit("show_desktop", show_desktop)
+
+    def switcher_open(self):
+        executor.submit("switcher_open", switcher_open)
+
+    def switcher_left(self):
+        executor.submit("switcher_left", switcher_left)
+
+    def switcher_right(self):
+        executor.submit("switcher_right", switcher_right)
+
+    def switcher_close(self):
+        executor.submit("switcher_close", switcher_close)
+
+    def scroll(self, amount):
+        executor.submit("scroll", scroll, amount)
+
+    def double_click(self):
+        executor.submit("double_click", double_click)
+
+    def drag_start(self):
+        executor.submit("drag_start", drag_start)
+
+    def drag_end(self, hand_lost=False):
+        executor.submit("drag_end", drag_end, hand_lost)
+
+    def move_cursor(self, x, y, w, h, t):
+        # t is the frame's capture time; the filter predicts across the latency since
+        target = (x * SCREEN_W / w, y * SCREEN_H / h)
+        if self.output is not None:
+            self.output.update(target, t)
+            return
+        self.cursor_filter.update(target, t)
+        smooth_x, smooth_y = self.cursor_filter.position(time.time())
+        self.set_position((int(smooth_x), int(smooth_y)))
+
+    def left_click(self):
+        executor.submit("left_click", click, Button.left)
+
+    def right_click(self):
+        executor.submit("right_click", click, Button.right)
+
+
+mouse_actions = MouseActions()
+engine = build_mouse_engine(mouse_actions)
+ROI_TRACKING = os.environ.get("NEURO_ROI_TRACKING", "1") == "1"  # infer on a crop around last frame's hands
+INFER_EVERY = int(os.environ.get("NEURO_INFER_EVERY", "1"))  # >1: optical flow carries landmarks in between
+
+# Lite model while steering, full model while the task switcher is open (model_modes.py)
+CURSOR_MODES = ["cursor", "cursor.switcher"]
+
+with ModeGraph(CURSOR_MODES) as hands, ModeGraph(CURSOR_MODES) as roi_hands:
+    roi_tracker = RoiHandTracker(hands, roi_hands, enabled=ROI_TRACKING)
+    tracker = FlowHandTracker(roi_tracker, every=INFER_EVERY)
     while cap.isOpened():
-        ret, frame = cap.read()
+        ret, frame, rgb = cap.read_frame()
         if not ret:
             print("❌ Error: Unable to access camera.")
             break
 
-        frame = cv2.flip(frame, 1)
         h, w, _ = frame.shape
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb)
+        model_mode = "cursor.switcher" if engine.state("switcher") in SWITCHER_ON else "cursor"
+        hands.set_mode(model_mode)
+        roi_hands.set_mode(model_mode)
+        results = tracker.process(rgb)
 
         hand_detected = False
-        hand_data = []
         current_time = time.time()
 
         if results.multi_hand_landmarks:
             hand_detected = True
             last_hand_time = current_time
 
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-                index = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                thumb = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-                middle = hand_landmarks.landmark[mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-                ring = hand_landmarks.landmark[mp_hands.HandLandmark.RING_FINGER_TIP]
-
-                index_x, index_y = int(index.x * w), int(index.y * h)
-                thumb_x, thumb_y = int(thumb.x * w), int(thumb.y * h)
-                middle_x, middle_y = int(middle.x * w), int(middle.y * h)
-                ring_x, ring_y = int(ring.x * w), int(ring.y * h)
-
-                hand_data.append({
-                    'index': (index_x, index_y),
-                    'thumb': (thumb_x, thumb_y),
-                    'middle': (middle_x, middle_y),
-                    'ring': (ring_x, ring_y),
-                    'raw': hand_landmarks
-                })
-
-            if len(hand_data) == 2:
-                h1, h2 = hand_data
-                tx1, ty1 = h1['thumb']
-                tx2, ty2 = h2['thumb']
-                ix1, iy1 = h1['index']
-                ix2, iy2 = h2['index']
-
-                thumb_distance = distance((tx1, ty1), (tx2, ty2))
-                index_distance = distance((ix1, iy1), (ix2, iy2))
-                center_x = (tx1 + tx2) // 2
-
-                # 🧹 Minimize All Windows
-                if thumb_distance > 150 and iy1 > ty1 and iy2 > ty2 and not task_switcher_active:
-                    print("🧹 Minimizing All Windows – Show Desktop")
-                    pyautogui.hotkey('win', 'd')
-                    time.sleep(1)
-                    continue
-
-                # 🌀 Task Switcher
-                if thumb_distance < 60:
-                    if not task_switcher_active and direction_hold_start is None:
-                        direction_hold_start = current_time
-                    elif not task_switcher_active and current_time - direction_hold_start > 1:
-                        print("🌀 Task Switcher Activated")
-                        pyautogui.keyDown('alt')
-                        pyautogui.press('tab')
-                        task_switcher_active = True
-                        direction = None
-                        direction_hold_start = None
-                    elif task_switcher_active:
-                        if center_x < w // 3:
-                            if direction != 'left':
-                                direction = 'left'
-                                direction_hold_start = current_time
-                            elif current_time - direction_hold_start > SWITCH_DELAY:
-                                print("⬅ Switching Left")
-                                pyautogui.keyDown('shift')
-                                pyautogui.press('tab')
-                                pyautogui.keyUp('shift')
-                                direction_hold_start = current_time
-                        elif center_x > 2 * w // 3:
-                            if direction != 'right':
-                                direction = 'right'
-                                direction_hold_start = current_time
-                            elif current_time - direction_hold_start > SWITCH_DELAY:
-                                print("➡ Switching Right")
-                                pyautogui.press('tab')
-                                direction_hold_start = current_time
-                        else:
-                            direction = None
-                            direction_hold_start = None
-                else:
-                    if task_switcher_active:
-                        print("✅ Task Selected, Exiting Task Switcher")
-                        pyautogui.keyUp('alt')
-                        task_switcher_active = False
-                    direction_hold_start = None
-
-                # 🖱️ Scroll with 2 hands
-                if not task_switcher_active and thumb_distance > 60:
-                    vertical_distance = abs(iy1 - iy2)
-                    scroll_amount = int(vertical_distance / scroll_sensitivity)
-                    if scroll_amount > 0:
-                        if iy1 > iy2:
-                            print("⬇ Scrolling Down")
-                            mouse.scroll(0, -scroll_amount)
-                        elif iy1 < iy2:
-                            print("⬆ Scrolling Up")
-                            mouse.scroll(0, scroll_amount)
-
-                # 🖱️ Double Click and Drag Using Both Index Fingers
-                if index_distance < 30:
-                    if index_finger_hold_start is None:
-                        index_finger_hold_start = current_time
-                    else:
-                        hold_duration = current_time - index_finger_hold_start
-                        if not dragging and hold_duration >= 0.5:
-                            print("🖱️ Drag Start")
-                            mouse.press(Button.left)
-                            dragging = True
-                else:
-                    if index_finger_hold_start:
-                        hold_duration = current_time - index_finger_hold_start
-                        if not dragging and hold_duration < 0.5:
-                            print("🖱️ Double Click Triggered")
-                            mouse.click(Button.left, 2)
-                        elif dragging:
-                            print("🖱️ Drag End")
-                            mouse.release(Button.left)
-                            dragging = False
-                        index_finger_hold_start = None
-
-            elif len(hand_data) == 1 and not task_switcher_active:
-                data = hand_data[0]
-                screen_w, screen_h = pyautogui.size()
-                index_pos = data['index']
-
-                target_x = index_pos[0] * screen_w // w
-                target_y = index_pos[1] * screen_h // h
-                smooth_x = prev_mouse_x + (target_x - prev_mouse_x) // smoothing
-                smooth_y = prev_mouse_y + (target_y - prev_mouse_y) // smoothing
-                mouse.position = (smooth_x, smooth_y)
-                prev_mouse_x, prev_mouse_y = smooth_x, smooth_y
-
-                # Left Click
-                if distance(data['thumb'], data['index']) < 30:
-                    mouse.click(Button.left, 1)
-
-                # Right Click
-                if distance(data['index'], data['middle']) < 30:
-                    mouse.click(Button.right, 1)
-
-                # If one hand disappears while dragging
-                if dragging:
-                    print("🖱️ Drag End (Hand Lost)")
-                    mouse.release(Button.left)
-                    dragging = False
-                index_finger_hold_start = None
-
-        # ⏱️ Auto Return
+            pts = hand_arrays.fill(results, w, h)  # (hands, 21, 3) pixels
+            if preview.visible():
+                draw_hands(frame, pts)
+            # Every gesture is a declared state machine (mouse_gestures.py)
+            engine.step((pts, w, h), cap.timestamp or current_time)
+
+        # 💤 Idle tier until something moves
         if not hand_detected and (current_time - last_hand_time > HAND_TIMEOUT):
-            print("🔙 No hand detected — Returning to mainUI.py")
-            cap.release()
-            cv2.destroyAllWindows()
-            try:
-                import mainUI
-            except ImportError:
-                subprocess.run(['python', 'mainUI.py'])
-            exit()
-
-        cv2.imshow("Neuro-Mouse Control Center (Timeout-10 Second)", frame)
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+            print("💤 No hand detected — idling until something moves")
+            # No time limit: mainUI keeps mouse control running, so it stays parked here
+            if idle_gate.wait_for_motion(cap, None, preview) != "motion":
+                break
+            print("👋 Motion detected — resuming hand tracking")
+            last_hand_time = time.time()
+            continue
+
+        if not preview.show(frame):
+            print(f"📊 ROI tracking: {roi_tracker.stats()} | Flow: {tracker.stats()} | Cursor: {mouse_actions.stats()} | Actions: {executor.stats()} | Preview: {preview.stats()}")
             break
 
+executor.close()
 cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+preview.close()
\ No newline at end of file
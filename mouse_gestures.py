@@ -0,0 +1,149 @@
+from gesture_engine import GestureEngine, GestureMachine, T
+from landmarks import distances, THUMB_TIP, INDEX_TIP, MIDDLE_TIP
+
+# Gesture table for mouse control. The frame context is (pts, w, h) with pts the
+# (hands, 21, 3) pixel array from landmarks.HandArrays; side effects go through
+# an actions object so the same table runs against the OS, a queue or nothing.
+
+SHOW_DESKTOP_SPREAD = 150  # thumbs further apart than this (index tips below thumbs)
+SWITCHER_PINCH = 60        # thumbs closer than this arm / hold the task switcher
+SWITCHER_ARM_TIME = 1.0
+SWITCH_DELAY = 1.0
+SHOW_DESKTOP_COOLDOWN = 1.0
+SCROLL_SENSITIVITY = 5
+INDEX_TOUCH = 30           # both index tips touching
+DRAG_HOLD = 0.5            # touching longer than this starts a drag, shorter double-clicks
+CLICK_PINCH = 30
+
+SWITCHER_ON = ("active", "left", "right")
+
+
+class GestureActions:
+    # Interface the table drives; every hook is a no-op here (used by benchmarks)
+    def show_desktop(self): pass
+    def switcher_open(self): pass
+    def switcher_left(self): pass
+    def switcher_right(self): pass
+    def switcher_close(self): pass
+    def scroll(self, amount): pass
+    def double_click(self): pass
+    def drag_start(self): pass
+    def drag_end(self, hand_lost=False): pass
+    def move_cursor(self, x, y, w, h, t): pass
+    def left_click(self): pass
+    def right_click(self): pass
+
+
+# ─── Features (each computed at most once per frame) ──────────────────
+def _two_hand_distances(f):
+    pts = f.ctx[0]
+    return distances(pts[0, [THUMB_TIP, INDEX_TIP]], pts[1, [THUMB_TIP, INDEX_TIP]])
+
+
+def _desktop_pose(f):
+    pts = f.ctx[0]
+    thumbs_below = bool((pts[:, INDEX_TIP, 1] > pts[:, THUMB_TIP, 1]).all())
+    return f["thumb_distance"] > SHOW_DESKTOP_SPREAD and thumbs_below
+
+
+def _center_zone(f):
+    pts, w, _ = f.ctx
+    center_x = (pts[0, THUMB_TIP, 0] + pts[1, THUMB_TIP, 0]) // 2
+    if center_x < w // 3:
+        return "left"
+    if center_x > 2 * w // 3:
+        return "right"
+    return "middle"
+
+
+def _scroll_amount(f):
+    pts = f.ctx[0]
+    iy1, iy2 = pts[:, INDEX_TIP, 1]
+    amount = int(abs(iy1 - iy2) / SCROLL_SENSITIVITY)
+    return -amount if iy1 > iy2 else amount
+
+
+def _pinches(f):
+    hand = f.ctx[0][0]
+    return distances(hand[[THUMB_TIP, INDEX_TIP]], hand[[INDEX_TIP, MIDDLE_TIP]])
+
+
+FEATURES = {
+    "hands": lambda f: len(f.ctx[0]),
+    "two_hand": _two_hand_distances,
+    "thumb_distance": lambda f: f["two_hand"][0],
+    "index_distance": lambda f: f["two_hand"][1],
+    "desktop_pose": _desktop_pose,
+    "center_zone": _center_zone,
+    "scroll_amount": _scroll_amount,
+    "pinches": _pinches,
+    "left_pinch": lambda f: f["pinches"][0] < CLICK_PINCH,
+    "right_pinch": lambda f: f["pinches"][1] < CLICK_PINCH,
+}
+
+
+def switcher_on(f):
+    return f.engine.state("switcher") in SWITCHER_ON
+
+
+def build_mouse_engine(actions):
+    a = actions
+    thumbs_together = lambda f: f["thumb_distance"] < SWITCHER_PINCH
+    thumbs_apart = lambda f: f["thumb_distance"] >= SWITCHER_PINCH
+    two_hands = lambda f: f["hands"] == 2
+
+    def close_switcher(f):
+        a.switcher_close()
+
+    machines = [
+        # 🧹 Show desktop, then a cooldown instead of sleeping in the loop
+        GestureMachine("show_desktop", [
+            T("idle", "cooldown", when=lambda f: f["desktop_pose"], do=lambda f: a.show_desktop()),
+            T("cooldown", "idle", after=SHOW_DESKTOP_COOLDOWN),
+        ], guard=lambda f: two_hands(f) and not switcher_on(f)),
+
+        # 🌀 Alt-Tab switcher: hold thumbs together to open, drift left/right to step
+        GestureMachine("switcher", [
+            T("idle", "arming", when=thumbs_together),
+            T("arming", "idle", when=thumbs_apart),
+            T("arming", "active", when=thumbs_together, do=lambda f: a.switcher_open(), after=SWITCHER_ARM_TIME),
+            T("active", "idle", when=thumbs_apart, do=close_switcher),
+            # Entering a zone only starts the clock: the first step comes SWITCH_DELAY
+            # later (left -> left), then one per SWITCH_DELAY while the hand stays
+            T("active", "left", when=lambda f: f["center_zone"] == "left"),
+            T("active", "right", when=lambda f: f["center_zone"] == "right"),
+            T("left", "idle", when=thumbs_apart, do=close_switcher),
+            T("left", "active", when=lambda f: f["center_zone"] != "left"),
+            T("left", "left", do=lambda f: a.switcher_left(), after=SWITCH_DELAY),
+            T("right", "idle", when=thumbs_apart, do=close_switcher),
+            T("right", "active", when=lambda f: f["center_zone"] != "right"),
+            T("right", "right", do=lambda f: a.switcher_right(), after=SWITCH_DELAY),
+        ], guard=two_hands),
+
+        # 🖱️ Two-hand scroll
+        GestureMachine("scroll", [
+            T("idle", "idle", when=lambda f: f["scroll_amount"] != 0, do=lambda f: a.scroll(f["scroll_amount"])),
+        ], guard=lambda f: two_hands(f) and not switcher_on(f) and thumbs_apart(f) and not f["desktop_pose"]),
+
+        # 🖱️ Both index tips: short touch double-clicks, long touch drags
+        GestureMachine("index_touch", [
+            T("idle", "touching", when=lambda f: f["index_distance"] < INDEX_TOUCH),
+            T("touching", "idle", when=lambda f: f["index_distance"] >= INDEX_TOUCH, do=lambda f: a.double_click()),
+            T("touching", "dragging", do=lambda f: a.drag_start(), after=DRAG_HOLD),
+            T("dragging", "idle", when=lambda f: f["index_distance"] >= INDEX_TOUCH, do=lambda f: a.drag_end()),
+        ], guard=two_hands,
+            reset_when=lambda f: f["hands"] == 1 and not switcher_on(f),
+            on_reset=lambda f, state: a.drag_end(hand_lost=True) if state == "dragging" else None),
+
+        # 🖱️ One hand steers the pointer and clicks
+        GestureMachine("cursor", [
+            T("idle", "idle", do=lambda f: a.move_cursor(*f.ctx[0][0, INDEX_TIP, :2], f.ctx[1], f.ctx[2], f.now)),
+        ], guard=lambda f: f["hands"] == 1 and not switcher_on(f)),
+        GestureMachine("left_click", [
+            T("idle", "idle", when=lambda f: f["left_pinch"], do=lambda f: a.left_click()),
+        ], guard=lambda f: f["hands"] == 1 and not switcher_on(f)),
+        GestureMachine("right_click", [
+            T("idle", "idle", when=lambda f: f["right_pinch"], do=lambda f: a.right_click()),
+        ], guard=lambda f: f["hands"] == 1 and not switcher_on(f)),
+    ]
+    return GestureEngine(FEATURES, machines)
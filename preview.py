@@ -0,0 +1,107 @@
+import os
+import signal
+import time
+import cv2
+
+# Preview policy for the vision loops, from NEURO_PREVIEW:
+#
+#   full       imshow + waitKey every frame (default)
+#   every=N    show every Nth frame
+#   fps=R      show at most R frames a second
+#   headless   no window at all; runs on servers and as a background service
+#
+# Quitting without a window: SIGTERM / Ctrl+C, creating NEURO_QUIT_FILE, or
+# NEURO_MAX_RUNTIME seconds running out. These work in every mode; 'q' in the
+# window still works whenever there is one.
+
+PREVIEW = os.environ.get("NEURO_PREVIEW", "full")
+QUIT_FILE = os.environ.get("NEURO_QUIT_FILE")
+MAX_RUNTIME = float(os.environ.get("NEURO_MAX_RUNTIME", "0")) or None
+
+
+def parse_preview(spec):
+    mode, _, value = spec.partition("=")
+    if mode in ("full", "headless"):
+        return mode, None
+    if mode == "every":
+        return mode, max(1, int(value))
+    if mode == "fps":
+        return mode, float(value)
+    raise ValueError(f"NEURO_PREVIEW: expected full, every=N, fps=R or headless, got {spec!r}")
+
+
+class Preview:
+    def __init__(self, window, spec=PREVIEW, quit_file=QUIT_FILE, max_runtime=MAX_RUNTIME):
+        self.window = window
+        self.mode, self.value = parse_preview(spec)
+        self.headless = self.mode == "headless"
+        self.quit_file = quit_file
+        self.deadline = time.time() + max_runtime if max_runtime else None
+        self.stop_reason = None
+        self.frames = 0
+        self.shown = 0
+        self.last_shown = 0.0
+        self.upcoming = None
+        signal.signal(signal.SIGINT, self._on_signal)
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, self._on_signal)
+
+    def _on_signal(self, signum, frame):
+        self.stop_reason = "signal"
+
+    def should_quit(self):
+        # Non-GUI quit checks; cheap enough for every frame
+        if self.stop_reason is None:
+            if self.quit_file and os.path.exists(self.quit_file):
+                self.stop_reason = "quit file"
+            elif self.deadline is not None and time.time() > self.deadline:
+                self.stop_reason = "max runtime"
+        return self.stop_reason is not None
+
+    def _due(self):
+        if self.mode == "full":
+            return True
+        if self.mode == "every":
+            return self.frames % self.value == 0
+        if self.mode == "fps":
+            now = time.time()
+            if now - self.last_shown >= 1.0 / self.value:
+                self.last_shown = now
+                return True
+        return False
+
+    def visible(self):
+        # Whether this frame's show() will display it: skip drawing overlays if not
+        if self.upcoming is None:
+            self.upcoming = not self.headless and self._due()
+        return self.upcoming
+
+    def show(self, frame, window=None):
+        # Returns False once the loop should stop
+        due = self.visible()
+        self.upcoming = None
+        self.frames += 1
+        if self.should_quit():
+            return False
+        if not due:
+            return True
+        self.shown += 1
+        cv2.imshow(window or self.window, frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            self.stop_reason = "key"
+            return False
+        return True
+
+    def flash(self, window, image, ms):
+        # One-off popup (e.g. the screenshot flash); skipped without a window
+        if not self.headless:
+            cv2.imshow(window, image)
+            cv2.waitKey(ms)
+            cv2.destroyWindow(window)
+
+    def stats(self):
+        return {"mode": self.mode, "frames": self.frames, "shown": self.shown, "stop": self.stop_reason}
+
+    def close(self):
+        if not self.headless:
+            cv2.destroyAllWindows()
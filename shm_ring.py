@@ -0,0 +1,156 @@
+import json
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+# Fixed-shape ring of numpy slots living in one shared-memory block.
+# Layout: [meta json | write_seq | slot seqs | slot timestamps | slot data]
+META_SIZE = 256
+EMPTY = -1
+WRITING = -2
+
+
+def _align(n, to=64):
+    return (n + to - 1) // to * to
+
+
+# Blocks this process created and still owns
+_created = set()
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    # Readers must not unlink the block when they exit (Python < 3.13 tracks every
+    # attach). Attaching to our own block would drop the owner's registration too,
+    # and the owner's unlink then makes the resource tracker complain at exit.
+    if name not in _created:
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+class ShmRing:
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        raw = bytes(shm.buf[:META_SIZE]).rstrip(b"\0")
+        meta = json.loads(raw.decode())
+        self.name = shm.name
+        self.slots = meta["slots"]
+        self.slot_shape = tuple(meta["shape"])
+        self.dtype = np.dtype(meta["dtype"])
+        self.info = meta.get("info", {})
+
+        offset = META_SIZE
+        self._write_seq = np.ndarray((1,), np.int64, shm.buf, offset)
+        offset += 64
+        self._seqs = np.ndarray((self.slots,), np.int64, shm.buf, offset)
+        offset = _align(offset + 8 * self.slots)
+        self._stamps = np.ndarray((self.slots,), np.float64, shm.buf, offset)
+        offset = _align(offset + 8 * self.slots)
+        self._data = np.ndarray((self.slots,) + self.slot_shape, self.dtype, shm.buf, offset)
+        if not owner:
+            self._data.flags.writeable = False
+
+    @staticmethod
+    def _size(slot_shape, dtype, slots):
+        slot_bytes = int(np.prod(slot_shape)) * np.dtype(dtype).itemsize
+        return META_SIZE + 64 + 2 * _align(8 * slots) + slot_bytes * slots
+
+    @classmethod
+    def create(cls, name, slot_shape, dtype, slots=4, info=None):
+        meta = json.dumps({"slots": slots, "shape": list(slot_shape),
+                           "dtype": np.dtype(dtype).str, "info": info or {}}).encode()
+        if len(meta) > META_SIZE:
+            raise ValueError("ring metadata too large")
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls._size(slot_shape, dtype, slots))
+        _created.add(name)
+        shm.buf[:META_SIZE] = meta.ljust(META_SIZE, b"\0")
+        ring = cls(shm, owner=True)
+        ring._write_seq[0] = 0
+        ring._seqs[:] = EMPTY
+        ring._stamps[:] = 0.0
+        return ring
+
+    @classmethod
+    def attach(cls, name):
+        return cls(_attach(name), owner=False)
+
+    # ─── Writer side ───────────────────────────────────────────────────
+    def claim(self):
+        # Writable view of the next slot; fill it in place, then commit()
+        seq = int(self._write_seq[0]) + 1
+        slot = seq % self.slots
+        self._seqs[slot] = WRITING
+        return self._data[slot]
+
+    def commit(self, timestamp=None):
+        seq = int(self._write_seq[0]) + 1
+        slot = seq % self.slots
+        self._stamps[slot] = time.time() if timestamp is None else timestamp
+        self._seqs[slot] = seq
+        self._write_seq[0] = seq
+        return seq
+
+    def write(self, array, timestamp=None):
+        np.copyto(self.claim(), array)
+        return self.commit(timestamp)
+
+    # ─── Reader side ───────────────────────────────────────────────────
+    @property
+    def write_seq(self):
+        return int(self._write_seq[0])
+
+    def latest(self):
+        # (seq, timestamp, read-only view) of the newest committed slot, or None
+        seq = self.write_seq
+        if seq <= 0:
+            return None
+        slot = seq % self.slots
+        if self._seqs[slot] != seq:
+            return None
+        return seq, float(self._stamps[slot]), self._data[slot]
+
+    def get(self, seq):
+        # (timestamp, read-only view) of slot `seq` if it still holds it, else None;
+        # for readers that need every item in order, not just the newest
+        slot = seq % self.slots
+        if self._seqs[slot] != seq:
+            return None
+        return float(self._stamps[slot]), self._data[slot]
+
+    def still_valid(self, seq):
+        # False once the writer has started reusing the slot that held `seq`
+        return self._seqs[seq % self.slots] == seq
+
+    def wait_next(self, last_seq, timeout=1.0, poll=0.001):
+        deadline = time.time() + timeout
+        while True:
+            item = self.latest()
+            if item is not None and item[0] > last_seq:
+                return item
+            if time.time() > deadline:
+                return None
+            time.sleep(poll)
+
+    def close(self):
+        # Drop numpy views first, otherwise the buffer can't be released
+        self._write_seq = self._seqs = self._stamps = self._data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # a caller still holds a slot view; the mapping goes away with the process
+        if self.owner:
+            _created.discard(self.name)
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,250 @@
+import json
+import os
+import time
+import wave
+from collections import deque
+import numpy as np
+
+# Speech recognition for voice_control.py, fed audio frame by frame.
+#
+#   vosk    offline and streaming: partial hypotheses while the user is still
+#           talking (`pip install vosk` plus a model dir, NEURO_VOSK_MODEL)
+#   google  the old recognize_google path: the utterance is uploaded once it ends
+#
+# Utterances are cut by a local voice-activity detector (webrtcvad when it is
+# installed, an energy gate otherwise), so a command ends ~0.45 s after the
+# user stops talking. NEURO_ASR_BACKEND picks the recogniser (default vosk,
+# falling back to google when vosk or its model is missing).
+#
+#   listener = SpeechListener(make_recognizer())
+#   text = listener.listen(audio_capture.subscribe(), on_partial=print)
+
+ASR_BACKEND = os.environ.get("NEURO_ASR_BACKEND", "vosk")
+VOSK_MODEL = os.environ.get("NEURO_VOSK_MODEL", "model")
+VAD_MODE = int(os.environ.get("NEURO_VAD_MODE", "2"))  # webrtcvad aggressiveness 0-3
+RATE = 16000
+FRAME_MS = 30
+FRAME = RATE * FRAME_MS // 1000  # samples per frame; webrtcvad takes 10/20/30 ms
+
+
+# ─── Voice activity ────────────────────────────────────────────────────
+class WebRtcVad:
+    def __init__(self, mode=VAD_MODE):
+        import webrtcvad
+        self.vad = webrtcvad.Vad(mode)
+
+    def is_speech(self, frame):
+        return self.vad.is_speech(frame.tobytes(), RATE)
+
+
+class EnergyVad:
+    # RMS against a running noise floor, for boxes without webrtcvad
+    def __init__(self, ratio=3.0, min_level=300.0):
+        self.ratio = ratio
+        self.min_level = min_level
+        self.noise = min_level / ratio
+
+    def is_speech(self, frame):
+        rms = float(np.sqrt(np.mean(np.square(frame, dtype=np.float32))))
+        speech = rms > max(self.noise * self.ratio, self.min_level)
+        if not speech:
+            self.noise = 0.95 * self.noise + 0.05 * rms
+        return speech
+
+
+def make_vad(mode=VAD_MODE):
+    try:
+        return WebRtcVad(mode)
+    except ImportError:
+        return EnergyVad()
+
+
+class Endpointer:
+    # Utterance starts after `start_ms` of speech in a row and ends after
+    # `end_ms` of silence (or `max_ms` in all). The frames just before the
+    # start are kept so the first syllable reaches the recogniser too.
+    def __init__(self, vad, start_ms=90, end_ms=450, max_ms=8000, pre_roll_ms=300):
+        self.vad = vad
+        self.start_frames = start_ms // FRAME_MS
+        self.end_frames = end_ms // FRAME_MS
+        self.max_frames = max_ms // FRAME_MS
+        self.pre_roll = deque(maxlen=pre_roll_ms // FRAME_MS)
+        self.reset()
+
+    def reset(self):
+        self.active = False
+        self.voiced = self.silent = self.length = 0
+        self.pre_roll.clear()
+
+    def feed(self, frame):
+        # "start", "speech", "end" or None (still waiting for speech)
+        speech = self.vad.is_speech(frame)
+        if not self.active:
+            self.pre_roll.append(frame)
+            self.voiced = self.voiced + 1 if speech else 0
+            if self.voiced >= self.start_frames:
+                self.active = True
+                self.silent = 0
+                self.length = len(self.pre_roll)
+                return "start"
+            return None
+        self.length += 1
+        self.silent = 0 if speech else self.silent + 1
+        if self.silent >= self.end_frames or self.length >= self.max_frames:
+            self.active = False
+            return "end"
+        return "speech"
+
+
+# ─── Recognisers ───────────────────────────────────────────────────────
+# start() before each utterance, accept(frame) returns the partial text when it
+# changed (else None), finish() returns the final text ("" if nothing was heard)
+class VoskRecognizer:
+    def __init__(self, model_path=VOSK_MODEL):
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+        SetLogLevel(-1)
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Vosk model not found at {model_path!r} (set NEURO_VOSK_MODEL)")
+        self.model = Model(model_path)  # the slow part; loaded once
+        self.KaldiRecognizer = KaldiRecognizer
+        self.rec = None
+
+    def start(self):
+        self.rec = self.KaldiRecognizer(self.model, RATE)
+        self.committed = []
+        self.partial = ""
+
+    def accept(self, frame):
+        if self.rec.AcceptWaveform(frame.tobytes()):
+            # Vosk closed a segment on its own; keep it and start a new partial
+            self.committed.append(json.loads(self.rec.Result())["text"])
+            hypothesis = ""
+        else:
+            hypothesis = json.loads(self.rec.PartialResult())["partial"]
+        partial = " ".join(self.committed + [hypothesis]).strip()
+        if partial == self.partial:
+            return None
+        self.partial = partial
+        return partial
+
+    def finish(self):
+        self.committed.append(json.loads(self.rec.FinalResult())["text"])
+        return " ".join(self.committed).strip()
+
+
+class GoogleRecognizer:
+    def __init__(self, language="en-in"):
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = sr.Recognizer()
+        self.language = language
+
+    def start(self):
+        self.chunks = []
+
+    def accept(self, frame):
+        self.chunks.append(frame.tobytes())
+        return None
+
+    def finish(self):
+        audio = self.sr.AudioData(b"".join(self.chunks), RATE, 2)
+        try:
+            return self.recognizer.recognize_google(audio, language=self.language)
+        except (self.sr.UnknownValueError, self.sr.RequestError):
+            return ""
+
+
+BACKENDS = {"vosk": VoskRecognizer, "google": GoogleRecognizer}
+
+
+def make_recognizer(name=None):
+    name = name or ASR_BACKEND
+    try:
+        return BACKENDS[name]()
+    except (ImportError, FileNotFoundError) as e:
+        if name == "google":
+            raise
+        print(f"⚠️ {name} recogniser unavailable ({e}); using google")
+        return GoogleRecognizer()
+
+
+# ─── Listening ─────────────────────────────────────────────────────────
+class SpeechListener:
+    def __init__(self, recognizer, vad=None, timeout=6.0):
+        self.recognizer = recognizer
+        self.endpointer = Endpointer(vad or make_vad())
+        self.timeout = timeout
+        self.timings = {}
+
+    def listen(self, frames, on_partial=None, timeout=None, on_start=None):
+        # frames: iterable of FRAME-sample int16 arrays. Returns the text, ""
+        # if nobody spoke within the timeout. If on_partial returns True the
+        # partial is taken as final right away, without waiting for the end.
+        # on_start() is called as soon as speech begins (barge-in).
+        # timings: audio seconds at speech start / first partial / endpoint,
+        # and the ms finish() took after the endpoint
+        timeout = self.timeout if timeout is None else timeout
+        self.endpointer.reset()
+        self.timings = {"start": None, "partial": None, "end": None, "final_ms": 0.0}
+        count = 0
+        started = False
+        for frame in frames:
+            count += 1
+            now = count * FRAME_MS / 1000
+            event = self.endpointer.feed(frame)
+            if event is None:
+                if timeout and now > timeout:
+                    return ""
+                continue
+            if event == "start":
+                started = True
+                self.timings["start"] = now
+                if on_start:
+                    on_start()
+                self.recognizer.start()
+                batch = list(self.endpointer.pre_roll)
+            else:
+                batch = [frame]
+            if event == "end":
+                self.timings["end"] = now
+                break
+            for f in batch:
+                partial = self.recognizer.accept(f)
+                if partial:
+                    if self.timings["partial"] is None:
+                        self.timings["partial"] = now
+                    if on_partial and on_partial(partial):
+                        self.timings["end"] = now
+                        return partial
+        if not started:
+            return ""
+        start = time.perf_counter()
+        text = self.recognizer.finish()
+        self.timings["final_ms"] = (time.perf_counter() - start) * 1000
+        return text
+
+
+# ─── Sources ───────────────────────────────────────────────────────────
+def read_wav(path):
+    # Mono 16 kHz int16 samples, whatever the file's layout
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        samples = np.frombuffer(f.readframes(f.getnframes()), np.int16)
+        channels, rate = f.getnchannels(), f.getframerate()
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if rate != RATE:
+        positions = np.arange(0, len(samples), rate / RATE)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    return samples
+
+
+def wav_frames(path, realtime=False, tail_ms=1000):
+    # A recorded clip as mic frames, plus trailing silence so the endpointer can close
+    samples = read_wav(path)
+    samples = np.concatenate([samples, np.zeros(RATE * tail_ms // 1000, np.int16)])
+    for i in range(0, len(samples) - FRAME + 1, FRAME):
+        if realtime:
+            time.sleep(FRAME_MS / 1000)
+        yield samples[i:i + FRAME]
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import deque, Counter
+
+# Text-to-speech for the voice assistant, off the listening thread. say()
+# queues a phrase and returns at once; a worker renders it with pyttsx3 to a
+# WAV file and plays that in 20 ms chunks, so interrupt() (barge-in) stops it
+# within a chunk and drops whatever is still queued.
+#
+#   tts = TtsService()
+#   tts.prerender(["Searching Wikipedia...", "According to Wikipedia"])
+#   tts.say("Searching Wikipedia...")
+#   tts.say("What should I search?", wait=True)    # before listening for the answer
+#   tts.interrupt()                                # the user started talking
+#
+# Renders are kept in NEURO_TTS_CACHE, keyed by text, voice and rate: phrases
+# passed to prerender() or said with cache=True, and any phrase said
+# `cache_after` times. Everything else is rendered to a temporary file.
+
+TTS_CACHE = os.environ.get("NEURO_TTS_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "neuro_tts"))
+TTS_DRIVER = os.environ.get("NEURO_TTS_DRIVER", "sapi5" if sys.platform == "win32" else None)
+TTS_VOICE = int(os.environ.get("NEURO_TTS_VOICE", "0"))  # index into the driver's voices
+PLAY_CHUNK_MS = 20
+
+
+class TtsService:
+    def __init__(self, cache_dir=TTS_CACHE, driver=TTS_DRIVER, voice=TTS_VOICE, cache_after=2):
+        self.cache_dir = cache_dir
+        self.driver = driver
+        self.voice = voice
+        self.cache_after = cache_after
+        self.pending = deque()  # (text, cache, generation) to be spoken
+        self.prerenders = deque()  # texts to render into the cache when nothing is to be spoken
+        self.seen = Counter()
+        self.generation = 0  # bumped by interrupt(); playback of older items stops
+        self.speaking = False
+        self.cond = threading.Condition()
+        self.running = True
+        self.said = self.cache_hits = self.rendered = self.interrupted = 0
+        self.render_time = 0.0
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout=5.0)  # the engine is created on the worker thread
+
+    # ─── Caller side ───────────────────────────────────────────────────
+    def say(self, text, cache=None, wait=False):
+        with self.cond:
+            self.seen[text] += 1
+            if cache is None:
+                cache = self.seen[text] >= self.cache_after
+            self.pending.append((text, cache, self.generation))
+            self.cond.notify_all()
+        if wait:
+            self.wait()
+
+    def prerender(self, phrases):
+        # Rendered to the cache in the background, without playing; anything
+        # said meanwhile goes first, so a cold cache never delays the greeting
+        with self.cond:
+            self.prerenders.extend(phrases)
+            self.cond.notify_all()
+
+    def interrupt(self):
+        with self.cond:
+            self.generation += 1
+            # Drop everything that would be heard; pre-renders carry on
+            if self.pending or self.speaking:
+                self.interrupted += 1
+            self.pending.clear()
+            self.cond.notify_all()
+
+    def _busy(self):
+        return self.speaking or bool(self.pending)
+
+    def busy(self):
+        with self.cond:
+            return self._busy()
+
+    def wait(self, timeout=None):
+        # Until nothing is playing or queued to play
+        deadline = None if timeout is None else time.time() + timeout
+        with self.cond:
+            while self.running and self._busy():
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    # ─── Worker side ───────────────────────────────────────────────────
+    def _setup(self):
+        try:
+            import pythoncom  # sapi5 needs COM on this thread
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass
+        import pyttsx3
+        import pyaudio
+        self.engine = pyttsx3.init(self.driver) if self.driver else pyttsx3.init()
+        voices = self.engine.getProperty('voices')
+        if voices:
+            self.engine.setProperty('voice', voices[min(self.voice, len(voices) - 1)].id)
+        self.voice_key = f"{self.engine.getProperty('voice')}|{self.engine.getProperty('rate')}"
+        self.audio = pyaudio.PyAudio()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, text):
+        digest = hashlib.sha1(f"{self.voice_key}\n{text}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".wav")
+
+    def _render(self, text, path):
+        start = time.perf_counter()
+        # Written beside the target and moved in, so a half-written file is never cached
+        tmp = f"{path}.{os.getpid()}.tmp.wav"
+        self.engine.save_to_file(text, tmp)
+        self.engine.runAndWait()
+        os.replace(tmp, path)
+        self.rendered += 1
+        self.render_time += time.perf_counter() - start
+
+    def _audio_for(self, text, cache):
+        # (path, temporary)
+        if not cache:
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            self._render(text, path)
+            return path, True
+        path = self.cache_path(text)
+        if os.path.exists(path):
+            self.cache_hits += 1
+        else:
+            self._render(text, path)
+        return path, False
+
+    def _play(self, path, generation):
+        with wave.open(path, "rb") as f:
+            stream = self.audio.open(format=self.audio.get_format_from_width(f.getsampwidth()),
+                                     channels=f.getnchannels(), rate=f.getframerate(), output=True)
+            chunk = max(1, f.getframerate() * PLAY_CHUNK_MS // 1000)
+            try:
+                data = f.readframes(chunk)
+                while data and self.running and generation == self.generation:
+                    stream.write(data)
+                    data = f.readframes(chunk)
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+    def _run(self):
+        try:
+            self._setup()
+        except Exception as e:
+            print(f"⚠️ Text-to-speech unavailable: {e}")
+            self.running = False
+            return
+        finally:
+            self.ready.set()
+        while True:
+            with self.cond:
+                while self.running and not (self.pending or self.prerenders):
+                    self.cond.wait()
+                if not self.running:
+                    return
+                if self.pending:
+                    text, cache, generation = self.pending.popleft()
+                    if generation != self.generation:
+                        continue
+                    self.speaking = True
+                else:
+                    text, cache, generation = self.prerenders.popleft(), True, self.generation
+            try:
+                path, temporary = self._audio_for(text, cache)
+                if self.speaking and generation == self.generation:
+                    self._play(path, generation)
+                    self.said += generation == self.generation
+                if temporary:
+                    os.remove(path)
+            except Exception as e:
+                print(f"⚠️ Could not speak {text[:40]!r}: {e}")
+            with self.cond:
+                self.speaking = False
+                self.cond.notify_all()
+
+    def stats(self):
+        return {"said": self.said, "cache_hits": self.cache_hits, "rendered": self.rendered,
+                "interrupted": self.interrupted,
+                "render_ms": round(self.render_time / max(self.rendered, 1) * 1000, 1)}
+
+    def close(self):
+        with self.cond:
+            self.running = False
+            self.generation += 1
+            self.cond.notify_all()
+        self.thread.join(timeout=2.0)
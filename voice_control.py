@@ -2,27 +2,39 @@ import sys
 import os
 import random
 import time
-import math
 import numpy as np
 import datetime
-import pyttsx3
 import pywhatkit as kit
 import wikipedia
 import webbrowser
 import smtplib
 import pyjokes
-import pyaudio
-import speech_recognition as sr
 import subprocess
 from PyQt5 import QtWidgets, QtGui, QtCore
+from speech_backend import SpeechListener, make_recognizer, FRAME
+from audio_capture import start_audio, subscribe
+from assistant_commands import AssistantActions, build_assistant_registry
+from tts_service import TtsService
 
 # ======= Assistant Functions ========
-engine = pyttsx3.init('sapi5')
-engine.setProperty('voice', engine.getProperty('voices')[0].id)
+# Speech is queued and played off this thread; fixed phrases come from a disk cache
+# Barge-in (talking over the assistant stops it) needs a headset or echo
+# cancelling; with open speakers the assistant would hear, and obey, itself.
+# Off by default: listening waits until speech has finished.
+BARGE_IN = os.environ.get("NEURO_BARGE_IN", "0") == "1"
+STATIC_PHRASES = [
+    "Good Morning!", "Good Afternoon!", "Good Evening!",
+    "I am your Assistant Sir. Please tell me how may I help you",
+    "What should I search?", "Searching Wikipedia...", "According to Wikipedia",
+    "What should I say?", "Email has been sent!", "Sorry, I couldn't send the email.",
+    "Searching online...", "Sorry, I encountered an issue.",
+    "Thanks for using me Sir, have a good day.", "No voice detected. Returning to main user interface.",
+]
+tts = TtsService()
+tts.prerender(STATIC_PHRASES)
 
-def speak(audio):
-    engine.say(audio)
-    engine.runAndWait()
+def speak(audio, wait=False):
+    tts.say(audio, cache=audio in STATIC_PHRASES or None, wait=wait)
 
 def wishMe():
     hour = datetime.datetime.now().hour
@@ -30,108 +42,178 @@ def wishMe():
     speak(greeting)
     speak("I am your Assistant Sir. Please tell me how may I help you")
 
-def takeCommand():
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        r.adjust_for_ambient_noise(source)
-        try:
-            audio = r.listen(source, timeout=6)
-        except sr.WaitTimeoutError:
-            return "none"
-    try:
-        return r.recognize_google(audio, language='en-in').lower()
-    except:
-        return "none"
+# The mic is opened once (or shared with a running audio_capture.py) and fanned
+# out to the waveform and the recogniser
+audio = start_audio()
+commands = subscribe()
 
-def performCommand(command):
-    command = command.lower()
+# Streaming recogniser (offline Vosk by default, NEURO_ASR_BACKEND=google for the old path)
+listener = SpeechListener(make_recognizer(), timeout=6)
+
+def barge_in():
+    if tts.busy():
+        tts.interrupt()
+
+def takeCommand(on_partial=None):
+    if not BARGE_IN:
+        tts.wait()  # don't hear our own voice as a command
+    commands.skip()  # only what is said from now on
+    command = listener.listen(commands, on_partial, on_start=barge_in if BARGE_IN else None)
+    return command.lower() if command else "none"
+
+APP_COMMANDS = {
+    "notepad": "start notepad", "calculator": "start calc", "command prompt": "start cmd",
+    "camera": "start microsoft.windows.camera:", "control panel": "control",
+    "paint": "start mspaint", "vs code": "code",
+}
+
+
+class VoiceActions(AssistantActions):
+    def open_app(self, app):
+        os.system(APP_COMMANDS[app])
+
+    def open_youtube(self):
+        webbrowser.open("https://youtube.com")
+
+    def open_google(self):
+        speak("What should I search?", wait=True)
+        query = takeCommand()
+        if query != "none":
+            webbrowser.open(f"https://www.google.com/search?q={query}")
+
+    def play_music(self):
+        music_dir = 'C:\\Users\\YourName\\Music'
+        songs = os.listdir(music_dir)
+        os.startfile(os.path.join(music_dir, random.choice(songs)))
+
+    def tell_time(self):
+        speak(f"The time is {datetime.datetime.now().strftime('%H:%M:%S')}")
+
+    def joke(self):
+        speak(pyjokes.get_joke())
+
+    def wikipedia(self, query):
+        speak('Searching Wikipedia...')
+        results = wikipedia.summary(query, sentences=2)
+        speak("According to Wikipedia")
+        speak(results)
+
+    def email(self):
+        speak("What should I say?", wait=True)
+        content = takeCommand()
+        if content != "none":
+            try:
+                to = "example@example.com"
+                server = smtplib.SMTP('smtp.gmail.com', 587)
+                server.starttls()
+                server.login('your_email@gmail.com', 'your_password')
+                server.sendmail('your_email@gmail.com', to, content)
+                server.quit()
+                speak("Email has been sent!")
+            except:
+                speak("Sorry, I couldn't send the email.")
+
+    def goodbye(self):
+        speak("Thanks for using me Sir, have a good day.", wait=True)
+        QtWidgets.QApplication.quit()
+
+    def shutdown(self):
+        os.system("shutdown /s /t 5")
+
+    def restart(self):
+        os.system("shutdown /r /t 5")
 
+    def sleep(self):
+        os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+
+    def search(self, query):
+        speak("Searching online...")
+        kit.search(query)
+
+
+# Trigger phrases live in assistant_commands.py, compiled into one matcher
+assistant = build_assistant_registry(VoiceActions())
+
+def performCommand(command):
     try:
-        if 'open notepad' in command:
-            os.system('start notepad')
-        elif 'open calculator' in command:
-            os.system('start calc')
-        elif 'open command prompt' in command:
-            os.system('start cmd')
-        elif 'open camera' in command:
-            os.system('start microsoft.windows.camera:')
-        elif 'open control panel' in command:
-            os.system('control')
-        elif 'open paint' in command:
-            os.system('start mspaint')
-        elif 'open vs code' in command:
-            os.system("code")
-        elif 'play music' in command:
-            music_dir = 'C:\\Users\\YourName\\Music'
-            songs = os.listdir(music_dir)
-            os.startfile(os.path.join(music_dir, random.choice(songs)))
-        elif 'time' in command:
-            speak(f"The time is {datetime.datetime.now().strftime('%H:%M:%S')}")
-        elif 'joke' in command:
-            speak(pyjokes.get_joke())
-        elif 'wikipedia' in command:
-            speak('Searching Wikipedia...')
-            command = command.replace("wikipedia", "")
-            results = wikipedia.summary(command, sentences=2)
-            speak("According to Wikipedia")
-            speak(results)
-        elif 'open youtube' in command:
-            webbrowser.open("https://youtube.com")
-        elif 'open google' in command:
-            speak("What should I search?")
-            query = takeCommand()
-            if query != "none":
-                webbrowser.open(f"https://www.google.com/search?q={query}")
-        elif 'shutdown' in command:
-            os.system("shutdown /s /t 5")
-        elif 'restart' in command:
-            os.system("shutdown /r /t 5")
-        elif 'sleep' in command:
-            os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-        elif 'email' in command:
-            speak("What should I say?")
-            content = takeCommand()
-            if content != "none":
-                try:
-                    to = "example@example.com"
-                    server = smtplib.SMTP('smtp.gmail.com', 587)
-                    server.starttls()
-                    server.login('your_email@gmail.com', 'your_password')
-                    server.sendmail('your_email@gmail.com', to, content)
-                    server.quit()
-                    speak("Email has been sent!")
-                except:
-                    speak("Sorry, I couldn't send the email.")
-        elif 'no thanks' in command or 'you can sleep' in command:
-            speak("Thanks for using me Sir, have a good day.")
-            QtWidgets.QApplication.quit()
-        else:
-            speak("Searching online...")
-            kit.search(command)
+        assistant.dispatch(command.lower())
     except Exception as e:
         speak("Sorry, I encountered an issue.")
 
 # ======= GUI Components ========
+# Spokes drawn around the circle; audio chunks are decimated to this (0 = one per sample)
+WAVE_SPOKES = int(os.environ.get("NEURO_WAVE_SPOKES", "256"))
+
+
+class WaveBuffer:
+    # Hands audio from the listener thread to the widget without locks or Qt
+    # calls: the writer decimates each chunk into the back buffer with
+    # preallocated scratch arrays and publishes it by bumping `seq`; the front
+    # buffer is always buffers[seq % 2]. The widget copies the front out on its
+    # own timer tick and retries if a write was published meanwhile.
+    def __init__(self, size=WAVE_SPOKES, chunk=FRAME):
+        # Bins must split the chunk evenly: the largest such count up to `size`
+        size = min(size or chunk, chunk)
+        while chunk % size:
+            size -= 1
+        self.size = size
+        per_bin = chunk // self.size
+        self.buffers = np.zeros((2, self.size), np.float32)
+        self.scaled = np.empty((self.size, per_bin), np.float32)
+        self.magnitude = np.empty((self.size, per_bin), np.float32)
+        self.peak = np.empty(self.size, np.intp)
+        self.offsets = np.arange(self.size) * per_bin
+        self.seq = 0
+        self.written = 0
+
+    def write(self, samples):
+        # int16 chunk -> largest-magnitude sample of each bin, normalised to [-1, 1]
+        back = self.buffers[(self.seq + 1) % 2]
+        np.multiply(samples.reshape(self.scaled.shape), 1 / 32768, out=self.scaled)
+        np.abs(self.scaled, out=self.magnitude)
+        np.argmax(self.magnitude, axis=1, out=self.peak)
+        np.add(self.peak, self.offsets, out=self.peak)
+        np.take(self.scaled.reshape(-1), self.peak, out=back)
+        self.seq += 1
+        self.written += 1
+
+    def read_into(self, out):
+        # Returns the seq copied, or None if writes kept landing mid-copy
+        for _ in range(4):
+            seq = self.seq
+            np.copyto(out, self.buffers[seq % 2])
+            if self.seq == seq:
+                return seq
+        return None
+
+
 class CircularWaveform(QtWidgets.QWidget):
-    def __init__(self):
+    def __init__(self, buffer=None):
         super().__init__()
-        self.display_data = np.zeros(1024)
+        self.buffer = buffer or WaveBuffer()
+        self.display_data = np.zeros(self.buffer.size, np.float32)
+        self.snapshot = np.zeros(self.buffer.size, np.float32)
+        self.seen = 0
+        angles = np.radians(np.arange(self.buffer.size) * (360 / self.buffer.size))
+        self.unit = np.stack([np.cos(angles), np.sin(angles)], axis=1)  # (cos, sin) per spoke
         self.setStyleSheet("background-color: black;")
         self.setFixedSize(800, 600)
         self.threshold = 0.01
+        # The only repaint source: new audio is picked up here, at display rate
         self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.fade_to_silence)
+        self.timer.timeout.connect(self.tick)
         self.timer.start(30)
 
-    def update_waveform(self, data):
-        if np.max(np.abs(data)) > self.threshold:
-            self.display_data = data
+    def tick(self):
+        seq = self.buffer.seq
+        if seq != self.seen and self.buffer.read_into(self.snapshot) is not None:
+            self.seen = seq
+            if np.max(np.abs(self.snapshot)) > self.threshold:
+                self.display_data[:] = self.snapshot
+            else:
+                self.display_data *= 0.9
         else:
-            self.display_data *= 0.9
-        self.update()
-
-    def fade_to_silence(self):
-        self.display_data *= 0.95
+            self.display_data *= 0.95
         self.update()
 
     def paintEvent(self, event):
@@ -142,15 +224,13 @@ class CircularWaveform(QtWidgets.QWidget):
         painter.setPen(pen)
         center = self.rect().center()
         radius = 200
-        angle_step = 360 / len(self.display_data)
-        max_amp = np.max(np.abs(self.display_data)) or 1
+        data = self.display_data
+        max_amp = np.max(np.abs(data)) or 1
 
-        for i in range(len(self.display_data)):
-            angle = angle_step * i
-            amp = (self.display_data[i] / max_amp) * radius
-            x = center.x() + amp * math.cos(math.radians(angle))
-            y = center.y() + amp * math.sin(math.radians(angle))
-            painter.drawLine(center, QtCore.QPointF(x, y))
+        # All spoke ends in one NumPy expression, all spokes in one drawLines call
+        cx, cy = center.x(), center.y()
+        ends = self.unit * (data / max_amp * radius)[:, None] + (cx, cy)
+        painter.drawLines([QtCore.QLineF(cx, cy, x, y) for x, y in ends.tolist()])
 
         glow = QtGui.QRadialGradient(center, 30)
         glow.setColorAt(0, QtGui.QColor(0, 255, 255, 180))
@@ -160,22 +240,19 @@ class CircularWaveform(QtWidgets.QWidget):
         painter.drawEllipse(center, 30, 30)
 
 class AudioListener(QtCore.QThread):
-    def __init__(self, waveform_widget):
+    def __init__(self, buffer):
         super().__init__()
-        self.waveform_widget = waveform_widget
+        self.buffer = buffer
+        self.frames = subscribe()
         self.running = True
 
     def run(self):
-        p = pyaudio.PyAudio()
-        stream = p.open(format=pyaudio.paInt16, channels=1, rate=44100, input=True, frames_per_buffer=1024)
         while self.running:
-            data = stream.read(1024, exception_on_overflow=False)
-            audio_data = np.frombuffer(data, dtype=np.int16)
-            normalized = np.clip(audio_data / 32768.0, -1, 1)
-            self.waveform_widget.update_waveform(normalized)
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+            frame = self.frames.read(copy=False, timeout=0.5)
+            if frame is not None:
+                # Only writes into the shared buffer; the widget repaints on its own timer
+                self.buffer.write(frame)
+        self.frames.close()
 
     def stop(self):
         self.running = False
@@ -194,7 +271,7 @@ class VoiceCommandThread(QtCore.QThread):
 
         while self._running:
             self.update_status.emit("Listening...")
-            query = takeCommand()
+            query = takeCommand(lambda text: self.update_status.emit(f"Hearing: {text}"))
             now = time.time()
             if query != "none":
                 last_voice_time = now
@@ -202,7 +279,7 @@ class VoiceCommandThread(QtCore.QThread):
                 performCommand(query)
             elif now - last_voice_time > 15:
                 self.update_status.emit("Timeout reached. Returning to main UI.")
-                speak("No voice detected. Returning to main user interface.")
+                speak("No voice detected. Returning to main user interface.", wait=True)
                 subprocess.run(['python', 'mainUI.py'])
                 QtWidgets.QApplication.quit()
                 break
@@ -227,7 +304,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.label.setAlignment(QtCore.Qt.AlignCenter)
         self.label.setGeometry(0, 540, 800, 40)
 
-        self.audio_thread = AudioListener(self.waveform)
+        self.audio_thread = AudioListener(self.waveform.buffer)
         self.audio_thread.start()
 
         self.voice_thread = VoiceCommandThread(self)
@@ -241,6 +318,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.audio_thread.stop()
         self.audio_thread.wait()
         self.voice_thread.stop()
+        tts.close()
+        if audio is not None:
+            audio.close()
         event.accept()
 
 # ========= Run App =========